@@ -1,6 +1,8 @@
+import pandas as pd
 import streamlit as st
 
 import utils
+from caching import cache_stats
 
 # Set up Streamlit page configuration
 st.set_page_config(
@@ -314,6 +316,22 @@ utils.render_info_box(
     icon="💡",
 )
 
+# ==========================================
+# CACHE STATISTICS
+# ==========================================
+with st.sidebar.expander("⚙️ Cache Statistics", expanded=False):
+    # Hit and miss counts of every memoized function since the server started
+    stats = pd.DataFrame.from_dict(cache_stats(), orient="index")
+    if stats.empty:
+        st.caption("No cached function has been called yet.")
+    else:
+        stats["hit rate"] = stats["hits"] / (stats["hits"] + stats["misses"])
+        st.dataframe(
+            stats.sort_index(),
+            use_container_width=True,
+            column_config={"hit rate": st.column_config.NumberColumn(format="%.2f")},
+        )
+
 # ==========================================
 # FOOTER
 # ==========================================
@@ -0,0 +1,158 @@
+"""
+Shared Caching - Memoization for pure simulation and model functions
+Built on st.cache_data / st.cache_resource with bounded LRU size, TTL
+eviction, optional explicit keys and process-wide hit/miss counters
+"""
+
+import functools
+import hashlib
+import threading
+from itertools import chain
+
+import numpy as np
+import streamlit as st
+from sklearn import datasets
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_TTL = 3600
+# Stateful arguments that make a call unsuitable for caching
+RANDOM_STATES = (np.random.Generator, np.random.RandomState)
+
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(name, field):
+    with _stats_lock:
+        _stats.setdefault(name, {"calls": 0, "misses": 0})[field] += 1
+
+
+def memoize(
+    func=None,
+    *,
+    key=None,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    ttl: float = DEFAULT_TTL,
+    resource: bool = False,
+    persist: bool = False,
+):
+    """
+    Cache a pure function across Streamlit reruns and sessions.
+
+    Can be used bare (``@memoize``) or with options (``@memoize(ttl=60)``).
+    The least recently used entry is evicted once ``max_entries`` is reached
+    and entries expire ``ttl`` seconds after they were stored. Calls that
+    pass a NumPy random generator run uncached, because they must draw from
+    and advance the caller's generator.
+
+    Args:
+        func (callable): Function to cache.
+        key (callable | None): Builds the cache key from the call arguments.
+            Use it when arguments are unhashable or irrelevant to the result.
+            Defaults to hashing every argument.
+        max_entries (int): Maximum number of results per function held in
+            memory. Results persisted to disk are not evicted.
+        ttl (float): Seconds before a cached result expires.
+        resource (bool): Use ``st.cache_resource`` and share the returned
+            object instead of copying it, for fitted models and other
+            objects that are expensive to serialize.
+        persist (bool): Also store results on disk so they survive server
+            restarts. Persisted entries neither expire nor are evicted, they
+            stay until the cache is cleared, so never persist user data.
+
+    Returns:
+        callable: Cached version of ``func``.
+    """
+    if func is None:
+        return functools.partial(
+            memoize,
+            key=key,
+            max_entries=max_entries,
+            ttl=ttl,
+            resource=resource,
+            persist=persist,
+        )
+
+    name = f"{func.__module__}.{func.__qualname__}"
+    # Editing the wrapped function must invalidate its entries
+    version = hashlib.md5(func.__code__.co_code).hexdigest()
+
+    def compute(cache_key, version, _args, _kwargs):
+        _count(name, "misses")
+        return func(*_args, **_kwargs)
+
+    # Streamlit keys each cache by module and qualified name, so give every
+    # wrapped function its own cache
+    compute.__module__ = func.__module__
+    compute.__qualname__ = f"{func.__qualname__}.<cached>"
+    if resource and persist:
+        raise ValueError("Shared resources cannot be persisted to disk")
+    options = {"max_entries": max_entries, "ttl": ttl, "show_spinner": False}
+    if persist:
+        # Streamlit ignores the TTL of disk-persisted caches
+        options.update(persist="disk", ttl=None)
+    cache = st.cache_resource if resource else st.cache_data
+    cached = cache(**options)(compute)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if any(isinstance(arg, RANDOM_STATES) for arg in chain(args, kwargs.values())):
+            return func(*args, **kwargs)
+        cache_key = key(*args, **kwargs) if key else (args, kwargs)
+        _count(name, "calls")
+        return cached(cache_key, version, args, kwargs)
+
+    wrapper.clear = cached.clear
+    return wrapper
+
+
+def content_hash(data) -> str:
+    """
+    Digest of raw bytes or of a NumPy array's contents, shape and dtype.
+
+    Use it in ``key`` functions so large inputs are hashed once per call
+    instead of being pickled into the cache key.
+
+    Args:
+        data (bytes | np.ndarray): Uploaded file contents or an array.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, np.ndarray):
+        digest.update(f"{data.shape}{data.dtype}".encode())
+        data = np.ascontiguousarray(data).view(np.uint8)
+    digest.update(memoryview(data).cast("B"))
+    return digest.hexdigest()
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """
+    Return hit and miss counts of every memoized function in this process.
+
+    Returns:
+        dict: ``{"hits": int, "misses": int}`` keyed by function name.
+    """
+    with _stats_lock:
+        return {
+            name: {
+                "hits": counts["calls"] - counts["misses"],
+                "misses": counts["misses"],
+            }
+            for name, counts in _stats.items()
+        }
+
+
+def clear_caches() -> None:
+    """Drop every cached result and reset the counters."""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    with _stats_lock:
+        _stats.clear()
+
+
+# Cached toy dataset generators shared by the ML pages
+make_blobs = memoize(datasets.make_blobs)
+make_classification = memoize(datasets.make_classification)
+make_moons = memoize(datasets.make_moons)
@@ -1,14 +1,15 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
-from scipy import stats
+
+from distributions.registry import DISTRIBUTIONS
 
 
 def plot_exponential_distribution(rate, x, y=None):
     lower_bound = 0
     upper_bound = max(5 / rate, x + 1)  # Ensure the plot covers a reasonable range
     x_vals = np.linspace(lower_bound, upper_bound, 1000)
-    y_vals = stats.expon.pdf(x_vals, scale=1 / rate)
+    y_vals = DISTRIBUTIONS["Exponential"].frozen(scale=1 / rate).pdf(x_vals)
 
     fig, ax = plt.subplots()
     ax.plot(x_vals, y_vals, label="Exponential Distribution")
@@ -86,17 +87,18 @@ def exponential_distribution():
     )
 
     y = float(y_input) if y_input else None
+    expon = DISTRIBUTIONS["Exponential"].frozen(scale=1 / rate)
 
     if y is None:
-        area_left = stats.expon.cdf(x, scale=1 / rate)
+        area_left = expon.cdf(x)
         area_right = 1 - area_left
         st.success(
             f"Area to the left of x: {area_left:.4f} and Area to the right of x: {area_right:.4f}"
         )
     else:
-        area_left_x = stats.expon.cdf(x, scale=1 / rate)
+        area_left_x = expon.cdf(x)
         area_right_x = 1 - area_left_x
-        area_left_y = stats.expon.cdf(y, scale=1 / rate)
+        area_left_y = expon.cdf(y)
         area_right_y = 1 - area_left_y
         area_between = area_left_y - area_left_x
         st.success(f"Area between x and y: {area_between:.4f}")
@@ -125,7 +127,7 @@ def inverse_exponential_distribution():
     )
 
     proportion_left = area_left / 100
-    x = stats.expon.ppf(proportion_left, scale=1 / rate)
+    x = DISTRIBUTIONS["Exponential"].frozen(scale=1 / rate).ppf(proportion_left)
 
     st.success(
         f"The value of x such that {area_left:.2f}% of the distribution is to the left is: {x:.4f}"
@@ -3,7 +3,8 @@ import math
 import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
-from scipy import stats
+
+from distributions.registry import DISTRIBUTIONS
 
 
 def plot_normal_distribution(
@@ -14,10 +15,12 @@ def plot_normal_distribution(
     x_vals = np.linspace(lower_bound, upper_bound, 1000)
 
     if population:
-        y_vals = stats.norm.pdf(x_vals, loc=mean, scale=std_dev)
+        y_vals = DISTRIBUTIONS["Normal"].frozen(mean=mean, std_dev=std_dev).pdf(x_vals)
     else:
         std_error = std_dev / math.sqrt(sample_size)
-        y_vals = stats.norm.pdf(x_vals, loc=mean, scale=std_error)
+        y_vals = (
+            DISTRIBUTIONS["Normal"].frozen(mean=mean, std_dev=std_error).pdf(x_vals)
+        )
 
     fig, ax = plt.subplots()
     ax.plot(x_vals, y_vals, label="Normal Distribution")
@@ -99,17 +102,18 @@ def normal_distribution():
     )
 
     y = float(y_input) if y_input else None
+    norm = DISTRIBUTIONS["Normal"].frozen(mean=mean, std_dev=std_dev)
 
     if y is None:
-        area_left = stats.norm.cdf(x, loc=mean, scale=std_dev)
+        area_left = norm.cdf(x)
         area_right = 1 - area_left
         st.success(
             f"Area to the left of x: {area_left:.4f} and Area to the right of x: {area_right:.4f}"
         )
     else:
-        area_left_x = stats.norm.cdf(x, loc=mean, scale=std_dev)
+        area_left_x = norm.cdf(x)
         area_right_x = 1 - area_left_x
-        area_left_y = stats.norm.cdf(y, loc=mean, scale=std_dev)
+        area_left_y = norm.cdf(y)
         area_right_y = 1 - area_left_y
         area_between = area_left_y - area_left_x
         st.success(f"Area between x and y: {area_between:.4f}")
@@ -138,7 +142,7 @@ def inverse_normal_distribution():
     )
 
     proportion_left = area_left / 100
-    x = stats.norm.ppf(proportion_left, loc=mean, scale=std_dev)
+    x = DISTRIBUTIONS["Normal"].frozen(mean=mean, std_dev=std_dev).ppf(proportion_left)
 
     st.success(
         f"The value of x such that {area_left:.2f}% of the distribution is to the left is: {x:.4f}"
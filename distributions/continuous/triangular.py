@@ -1,7 +1,8 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
-from scipy.stats import triang
+
+from distributions.registry import DISTRIBUTIONS
 
 
 def calculate_triangular_distribution_stats(
@@ -38,9 +39,7 @@ def plot_triangular_distribution(a: float, b: float, c: float, x: float) -> None
         x (float): Point to highlight on the distribution.
     """
     x_vals = np.linspace(a, b, 1000)
-    scale = b - a
-    c_relative = (c - a) / scale
-    y_vals = triang.pdf(x_vals, c_relative, loc=a, scale=scale)
+    y_vals = DISTRIBUTIONS["Triangular"].frozen(left=a, mode=c, right=b).pdf(x_vals)
 
     fig, ax = plt.subplots()
     ax.plot(x_vals, y_vals, label="Triangular Distribution")
@@ -95,8 +94,9 @@ def main():
 
     mean, std_dev, skew = calculate_triangular_distribution_stats(a, b, c)
 
-    f_x = triang.pdf(x, (c - a) / (b - a), loc=a, scale=b - a)
-    p_x = triang.cdf(x, (c - a) / (b - a), loc=a, scale=b - a)
+    triang = DISTRIBUTIONS["Triangular"].frozen(left=a, mode=c, right=b)
+    f_x = triang.pdf(x)
+    p_x = triang.cdf(x)
 
     st.write(f"Mean: {mean:.4f}")
     st.write(f"Standard Deviation: {std_dev:.4f}")
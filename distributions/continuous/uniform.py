@@ -1,7 +1,8 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
-from scipy.stats import uniform
+
+from distributions.registry import DISTRIBUTIONS
 
 
 def calculate_uniform_distribution_stats(a: float, b: float) -> tuple[float, float]:
@@ -15,8 +16,9 @@ def calculate_uniform_distribution_stats(a: float, b: float) -> tuple[float, flo
     Returns:
         tuple: Mean and standard deviation.
     """
-    mean = (a + b) / 2
-    std_dev = (b - a) / np.sqrt(12)
+    spec = DISTRIBUTIONS["Uniform"]
+    mean = spec.mean(low=a, high=b)
+    std_dev = np.sqrt(spec.variance(low=a, high=b))
     return mean, std_dev
 
 
@@ -30,7 +32,7 @@ def plot_uniform_distribution(a: float, b: float, x: float) -> None:
         x (float): Point to highlight on the distribution.
     """
     x_vals = np.linspace(a - 0.1, b + 0.1, 1000)
-    y_vals = uniform.pdf(x_vals, loc=a, scale=b - a)
+    y_vals = DISTRIBUTIONS["Uniform"].frozen(low=a, high=b).pdf(x_vals)
 
     fig, ax = plt.subplots()
     ax.plot(x_vals, y_vals, label="Uniform Distribution")
@@ -79,7 +81,7 @@ def main():
 
     mean, std_dev = calculate_uniform_distribution_stats(a, b)
 
-    p_less_than_x = uniform.cdf(x, loc=a, scale=b - a)
+    p_less_than_x = DISTRIBUTIONS["Uniform"].frozen(low=a, high=b).cdf(x)
     p_greater_equal_x = 1 - p_less_than_x
 
     st.write(f"Mean: {mean:.4f}")
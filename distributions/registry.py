@@ -0,0 +1,253 @@
+"""
+Distribution Registry - One spec per distribution shared across pages
+Each spec bundles the parameter schema, a vectorized numpy.random.Generator
+sampler, the analytic mean and variance, and the matching scipy frozen object.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+import streamlit as st
+from scipy import stats
+from scipy.stats.distributions import rv_frozen
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """Schema of one distribution parameter, used to build its input slider."""
+
+    name: str
+    label: str
+    min_value: float
+    max_value: float
+    default: float
+    step: float = 0.1
+
+
+@dataclass(frozen=True)
+class DistributionSpec:
+    """Everything the app needs to know about one distribution."""
+
+    name: str
+    parameters: tuple[Parameter, ...]
+    sampler: Callable[..., np.ndarray]
+    frozen: Callable[..., rv_frozen]
+    mean: Callable[..., float]
+    variance: Callable[..., float]
+    validate: Callable[..., str | None] = lambda **params: None
+
+    def defaults(self) -> dict[str, float]:
+        """Return the default value of every parameter."""
+        return {p.name: p.default for p in self.parameters}
+
+    def sample(
+        self,
+        size: int | tuple[int, ...],
+        rng: np.random.Generator | None = None,
+        **params,
+    ) -> np.ndarray:
+        """
+        Draw samples with the distribution's Generator method.
+
+        Args:
+            size (int | tuple): Output shape.
+            rng (np.random.Generator | None): Generator to draw from.
+            **params: Distribution parameters, defaulting to the schema.
+
+        Returns:
+            np.ndarray: Samples of the requested shape.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        return self.sampler(rng, size, **{**self.defaults(), **params})
+
+
+def _pareto_mean(shape, scale):
+    return shape * scale / (shape - 1) if shape > 1 else np.inf
+
+
+def _pareto_variance(shape, scale):
+    if shape <= 2:
+        return np.inf
+    return scale**2 * shape / ((shape - 1) ** 2 * (shape - 2))
+
+
+def _check_triangular(left, mode, right):
+    if not left <= mode <= right or left == right:
+        return "Triangular parameters need Left ≤ Mode ≤ Right with Left < Right."
+    return None
+
+
+def _check_uniform(low, high):
+    if low >= high:
+        return "Uniform parameters need Lower Bound < Upper Bound."
+    return None
+
+
+DISTRIBUTIONS: dict[str, DistributionSpec] = {}
+
+
+def register(spec: DistributionSpec) -> DistributionSpec:
+    """Add a distribution to the registry, replacing any spec of the same name."""
+    DISTRIBUTIONS[spec.name] = spec
+    return spec
+
+
+register(
+    DistributionSpec(
+        name="Normal",
+        parameters=(
+            Parameter("mean", "Mean", -10.0, 10.0, 0.0),
+            Parameter("std_dev", "Standard Deviation", 0.1, 10.0, 1.0),
+        ),
+        sampler=lambda rng, size, mean, std_dev: rng.normal(mean, std_dev, size),
+        frozen=lambda mean, std_dev: stats.norm(loc=mean, scale=std_dev),
+        mean=lambda mean, std_dev: mean,
+        variance=lambda mean, std_dev: std_dev**2,
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Uniform",
+        parameters=(
+            Parameter("low", "Lower Bound", -10.0, 0.0, 0.0),
+            Parameter("high", "Upper Bound", 0.0, 10.0, 1.0),
+        ),
+        sampler=lambda rng, size, low, high: rng.uniform(low, high, size),
+        frozen=lambda low, high: stats.uniform(loc=low, scale=high - low),
+        mean=lambda low, high: (low + high) / 2,
+        variance=lambda low, high: (high - low) ** 2 / 12,
+        validate=_check_uniform,
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Exponential",
+        parameters=(Parameter("scale", "Scale", 0.1, 10.0, 1.0),),
+        sampler=lambda rng, size, scale: rng.exponential(scale, size),
+        frozen=lambda scale: stats.expon(scale=scale),
+        mean=lambda scale: scale,
+        variance=lambda scale: scale**2,
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Triangular",
+        parameters=(
+            Parameter("left", "Left", -10.0, 0.0, 0.0),
+            Parameter("mode", "Mode", -10.0, 10.0, 0.5),
+            Parameter("right", "Right", 0.0, 20.0, 1.0),
+        ),
+        sampler=lambda rng, size, left, mode, right: rng.triangular(
+            left, mode, right, size
+        ),
+        frozen=lambda left, mode, right: stats.triang(
+            (mode - left) / (right - left), loc=left, scale=right - left
+        ),
+        mean=lambda left, mode, right: (left + mode + right) / 3,
+        variance=lambda left, mode, right: (
+            (left**2 + mode**2 + right**2 - left * mode - left * right - mode * right)
+            / 18
+        ),
+        validate=_check_triangular,
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Gamma",
+        parameters=(
+            Parameter("shape", "Shape (k)", 0.1, 10.0, 2.0),
+            Parameter("scale", "Scale (θ)", 0.1, 10.0, 1.0),
+        ),
+        sampler=lambda rng, size, shape, scale: rng.gamma(shape, scale, size),
+        frozen=lambda shape, scale: stats.gamma(shape, scale=scale),
+        mean=lambda shape, scale: shape * scale,
+        variance=lambda shape, scale: shape * scale**2,
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Beta",
+        parameters=(
+            Parameter("a", "Alpha (α)", 0.1, 10.0, 2.0),
+            Parameter("b", "Beta (β)", 0.1, 10.0, 5.0),
+        ),
+        sampler=lambda rng, size, a, b: rng.beta(a, b, size),
+        frozen=lambda a, b: stats.beta(a, b),
+        mean=lambda a, b: a / (a + b),
+        variance=lambda a, b: a * b / ((a + b) ** 2 * (a + b + 1)),
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Lognormal",
+        parameters=(
+            Parameter("mu", "Log Mean (μ)", -2.0, 2.0, 0.0),
+            Parameter("sigma", "Log Standard Deviation (σ)", 0.1, 2.0, 0.5),
+        ),
+        sampler=lambda rng, size, mu, sigma: rng.lognormal(mu, sigma, size),
+        frozen=lambda mu, sigma: stats.lognorm(sigma, scale=np.exp(mu)),
+        mean=lambda mu, sigma: np.exp(mu + sigma**2 / 2),
+        variance=lambda mu, sigma: (np.exp(sigma**2) - 1) * np.exp(2 * mu + sigma**2),
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Pareto",
+        parameters=(
+            Parameter("shape", "Shape (α)", 0.5, 10.0, 3.0),
+            Parameter("scale", "Scale (xₘ)", 0.1, 10.0, 1.0),
+        ),
+        # Generator.pareto draws the Lomax form, shift and scale to classic Pareto
+        sampler=lambda rng, size, shape, scale: scale * (1 + rng.pareto(shape, size)),
+        frozen=lambda shape, scale: stats.pareto(shape, scale=scale),
+        mean=_pareto_mean,
+        variance=_pareto_variance,
+    )
+)
+
+register(
+    DistributionSpec(
+        name="Cauchy",
+        parameters=(
+            Parameter("loc", "Location", -10.0, 10.0, 0.0),
+            Parameter("scale", "Scale", 0.1, 10.0, 1.0),
+        ),
+        sampler=lambda rng, size, loc, scale: loc + scale * rng.standard_cauchy(size),
+        frozen=lambda loc, scale: stats.cauchy(loc=loc, scale=scale),
+        # Undefined moments are why the CLT does not apply to the Cauchy
+        mean=lambda loc, scale: np.nan,
+        variance=lambda loc, scale: np.nan,
+    )
+)
+
+
+def parameter_inputs(spec: DistributionSpec, key: str | None = None) -> dict:
+    """
+    Render one slider per parameter of ``spec`` and collect the values.
+
+    Args:
+        spec (DistributionSpec): Distribution whose parameters to render.
+        key (str | None): Prefix that keeps widget keys unique across pages.
+
+    Returns:
+        dict: Selected parameter values keyed by parameter name.
+    """
+    return {
+        p.name: st.slider(
+            p.label,
+            p.min_value,
+            p.max_value,
+            p.default,
+            p.step,
+            key=f"{key}_{spec.name}_{p.name}" if key else None,
+        )
+        for p in spec.parameters
+    }
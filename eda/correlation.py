@@ -0,0 +1,491 @@
+"""
+Correlation Engine - Pearson, Spearman and Kendall matrices and their views
+Columns are standardized once and multiplied in blocks on a bounded thread
+pool, with pairwise-complete counts only where values are missing. Pairs
+come from the upper triangle and wide matrices are clustered into tiles
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import pairwise
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+from threadpoolctl import threadpool_limits
+
+from caching import memoize
+from parallel import DEFAULT_MAX_WORKERS, partition_threads
+
+METHODS = ["pearson", "spearman", "kendall"]
+# Columns per matrix-product block
+BLOCK_COLUMNS = 256
+# Elements per batch of columns in the Kendall merge sort
+KENDALL_BLOCK_ELEMENTS = 1 << 22
+# Variances below this fraction of the sum of squares count as constant
+CONSTANT_TOL = 1e-12
+# Above this many variables the annotated heatmap becomes unreadable
+ANNOTATED_MAX_COLUMNS = 30
+# Largest number of rows and columns of tiles drawn in the browser
+MAX_TILES = 200
+
+# The BLAS thread limit is process-wide, so sessions take turns setting it
+_blas_lock = threading.Lock()
+
+
+def top_pairs(corr, k=5):
+    """
+    Strongest correlations between distinct variables.
+
+    Args:
+        corr (pd.DataFrame): Square correlation matrix.
+        k (int): Number of pairs.
+
+    Returns:
+        pd.DataFrame: ``Var1``, ``Var2`` and ``Correlation`` of the ``k``
+            pairs with the largest absolute correlation, strongest first.
+    """
+    values = corr.to_numpy()
+    i, j = np.triu_indices(len(values), k=1)
+    pairs = values[i, j]
+    valid = ~np.isnan(pairs)
+    i, j, pairs = i[valid], j[valid], pairs[valid]
+    strength = np.abs(pairs)
+    k = min(k, len(pairs))
+    top = np.argpartition(-strength, k - 1)[:k] if k else np.empty(0, dtype=int)
+    # Ties keep their order in the triangle, like DataFrame.nlargest
+    top = top[np.lexsort((top, -strength[top]))]
+    return pd.DataFrame(
+        {
+            "Var1": corr.columns[i[top]],
+            "Var2": corr.columns[j[top]],
+            "Correlation": pairs[top],
+        }
+    )
+
+
+def cluster_order(corr):
+    """Variable order that places strongly correlated variables together."""
+    if len(corr) < 3:
+        return np.arange(len(corr))
+    distance = 1 - np.abs(np.nan_to_num(corr.to_numpy()))
+    np.fill_diagonal(distance, 0)
+    condensed = squareform(np.clip(distance, 0, None), checks=False)
+    return leaves_list(linkage(condensed, method="average"))
+
+
+def tile(values, tiles):
+    """Average a square matrix over ``tiles x tiles`` blocks of near-equal size."""
+    edges = np.linspace(0, len(values), tiles + 1).astype(int)
+    # Block sums from a 2-D prefix sum, NaNs counted as missing
+    present = ~np.isnan(values)
+    sums = np.zeros((len(values) + 1,) * 2)
+    counts = np.zeros_like(sums)
+    sums[1:, 1:] = np.where(present, values, 0).cumsum(0).cumsum(1)
+    counts[1:, 1:] = present.cumsum(0).cumsum(1)
+
+    def blocks(prefix):
+        cut = prefix[np.ix_(edges, edges)]
+        return cut[1:, 1:] - cut[:-1, 1:] - cut[1:, :-1] + cut[:-1, :-1]
+
+    with np.errstate(invalid="ignore"):
+        return blocks(sums) / blocks(counts), edges
+
+
+def correlation_heatmap(corr, max_tiles=MAX_TILES):
+    """
+    Interactive heatmap of a wide correlation matrix.
+
+    Variables are ordered by hierarchical clustering on ``1 - |r|`` so
+    correlated groups form blocks. Beyond ``max_tiles`` variables the
+    ordered matrix is averaged into tiles, and hovering a tile names the
+    range of variables it covers.
+
+    Args:
+        corr (pd.DataFrame): Square correlation matrix.
+        max_tiles (int): Largest number of rows and columns drawn.
+
+    Returns:
+        go.Figure: Heatmap figure.
+    """
+    order = cluster_order(corr)
+    names = corr.columns[order].astype(str)
+    values = corr.to_numpy()[np.ix_(order, order)]
+    if len(names) > max_tiles:
+        values, edges = tile(values, max_tiles)
+        labels = [
+            f"{names[start]} … {names[stop - 1]} ({stop - start})"
+            for start, stop in pairwise(edges)
+        ]
+        title = f"Clustered Correlation Heatmap ({len(names)} variables in tiles)"
+    else:
+        labels = list(names)
+        title = "Clustered Correlation Heatmap"
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=values,
+            x=labels,
+            y=labels,
+            zmin=-1,
+            zmax=1,
+            colorscale="RdBu_r",
+            colorbar={"title": "Correlation"},
+            hovertemplate="%{y}<br>%{x}<br>r = %{z:.3f}<extra></extra>",
+        )
+    )
+    fig.update_layout(title=title, height=700, yaxis={"autorange": "reversed"})
+    fig.update_xaxes(showticklabels=len(labels) <= ANNOTATED_MAX_COLUMNS * 2)
+    fig.update_yaxes(showticklabels=len(labels) <= ANNOTATED_MAX_COLUMNS * 2)
+    return fig
+
+
+def _run_tasks(run, tasks, max_workers):
+    """Run blocks on a thread pool, splitting the cores with the BLAS inside."""
+    workers, threads = partition_threads(len(tasks), max_workers)
+    with (
+        _blas_lock,
+        threadpool_limits(threads, user_api="blas"),
+        ThreadPoolExecutor(max_workers=workers) as pool,
+    ):
+        list(pool.map(run, tasks))
+
+
+def _standardize(X):
+    """
+    Columns centred and scaled once, missing values zero-filled.
+
+    Returns:
+        tuple: Filled values, presence mask as floats, whether each column
+            is complete and whether it is constant.
+    """
+    present = ~np.isnan(X)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(X, axis=0) if X.size else np.zeros(X.shape[1])
+        std = np.nanstd(X, axis=0) if X.size else np.zeros(X.shape[1])
+    constant = ~(std > 0)
+    scale = np.where(constant, 1.0, std)
+    filled = np.where(present, (X - np.nan_to_num(mean)) / scale, 0.0)
+    return filled, present.astype(np.float64), present.all(axis=0), constant
+
+
+def _pearson_block(filled_a, mask_a, filled_b, mask_b, complete):
+    """Pearson correlations between two sets of standardized columns."""
+    if complete:
+        return filled_a.T @ filled_b / max(len(filled_a), 1)
+    # Pairwise-complete moments over the rows where both columns are present
+    n = mask_a.T @ mask_b
+    sum_a, sum_b = filled_a.T @ mask_b, mask_a.T @ filled_b
+    sq_a, sq_b = (filled_a**2).T @ mask_b, mask_a.T @ filled_b**2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = filled_a.T @ filled_b - sum_a * sum_b / n
+        var_a = sq_a - sum_a**2 / n
+        var_b = sq_b - sum_b**2 / n
+        corr = cov / np.sqrt(var_a * var_b)
+    flat = (var_a <= CONSTANT_TOL * sq_a) | (var_b <= CONSTANT_TOL * sq_b)
+    corr[(n < 2) | flat] = np.nan
+    return corr
+
+
+def _pearson(X, Y=None, block_columns=BLOCK_COLUMNS, max_workers=DEFAULT_MAX_WORKERS):
+    """Pearson matrix of ``X``, or between the columns of ``X`` and ``Y``."""
+    a = _standardize(X)
+    b = a if Y is None else _standardize(Y)
+    p, q = X.shape[1], b[0].shape[1]
+    tasks = [
+        (i, j)
+        for i in range(0, p, block_columns)
+        for j in range(0, q, block_columns)
+        if Y is not None or i <= j
+    ]
+    out = np.full((p, q), np.nan)
+
+    def run(task):
+        i, j = task
+        rows, cols = slice(i, i + block_columns), slice(j, j + block_columns)
+        complete = a[2][rows].all() and b[2][cols].all()
+        out[rows, cols] = _pearson_block(
+            a[0][:, rows], a[1][:, rows], b[0][:, cols], b[1][:, cols], complete
+        )
+
+    _run_tasks(run, tasks, max_workers)
+    if Y is None:
+        out = np.where(np.triu(np.ones((p, p), dtype=bool)), out, out.T)
+    out[a[3], :] = np.nan
+    out[:, b[3]] = np.nan
+    return np.clip(out, -1, 1)
+
+
+def _rank(X):
+    """Average ranks of each column, missing values left missing."""
+    return pd.DataFrame(X).rank().to_numpy()
+
+
+def _tie_pairs(sorted_values):
+    """Pairs of equal values in each row of a row-wise sorted array."""
+    index = np.arange(sorted_values.shape[-1])
+    starts = np.ones(sorted_values.shape, dtype=bool)
+    starts[..., 1:] = sorted_values[..., 1:] != sorted_values[..., :-1]
+    run_start = np.maximum.accumulate(np.where(starts, index, 0), axis=-1)
+    return (index - run_start).sum(axis=-1)
+
+
+def _inversions(values):
+    """
+    Strictly decreasing pairs in each row, by a bottom-up merge sort.
+
+    Values are doubled and right-hand run elements tagged with the low bit,
+    so one stable sort merges each pair of runs and puts ties left first.
+    The ``k``-th right-hand element lands at ``position``, after
+    ``position - k`` left-hand elements, so the other left-hand elements
+    are larger than it.
+    """
+    m, n = values.shape
+    size = 1 << max(n - 1, 0).bit_length()
+    # Padding above every value adds no inversions
+    runs = np.full((m, size), 2 * (values.max(initial=0) + 1), dtype=np.int64)
+    runs[:, :n] = 2 * values
+    count = np.zeros(m, dtype=np.int64)
+    width = 1
+    while width < size:
+        blocks = runs.reshape(m, size // (2 * width), 2 * width)
+        blocks[..., width:] += 1
+        blocks.sort(axis=-1, kind="stable")
+        right = blocks & 1
+        # Sum of width - (position - k) over the right-hand elements
+        per_block = width * width + width * (width - 1) // 2
+        positions = right @ np.arange(2 * width)
+        count += size // (2 * width) * per_block - positions.sum(axis=1)
+        blocks -= right
+        width *= 2
+    return count
+
+
+def _dense_rank(X):
+    """
+    Dense ranks from zero of each column of ``X``, one row per column.
+
+    Kendall's tau depends only on the order of the values, so the columns
+    are ranked once and rows of missing values are dropped from the ranks.
+    Contiguous rows keep every later sort on the last axis.
+    """
+    ranks = pd.DataFrame(X).rank(method="dense").fillna(0)
+    return np.ascontiguousarray(ranks.to_numpy(dtype=np.int64).T) - 1
+
+
+def _kendall_against(x, Y):
+    """
+    Kendall's tau-b of the ranks ``x`` with each row of ranks ``Y``.
+
+    Knight's algorithm: sort the pairs by ``x`` then ``y`` and count the
+    inversions left in ``y``, which are the discordant pairs, in
+    O(n log n) per column. All columns are handled by the same sorts.
+    """
+    n = len(x)
+    if n < 2 or not len(Y):
+        return np.full(len(Y), np.nan)
+    base = max(x.max(), Y.max()) + 1
+    total = n * (n - 1) // 2
+    x_ties = _tie_pairs(np.sort(x))
+    taus = []
+    step = max(1, KENDALL_BLOCK_ELEMENTS // n)
+    for start in range(0, len(Y), step):
+        block = Y[start : start + step]
+        # Sorted joint ranks order the pairs by x then y
+        keys = np.sort(x * base + block, axis=-1)
+        discordant = _inversions(keys % base)
+        y_ties = _tie_pairs(np.sort(block, axis=-1))
+        joint_ties = _tie_pairs(keys)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            taus.append(
+                (total - x_ties - y_ties + joint_ties - 2 * discordant)
+                / np.sqrt((total - x_ties) * (total - y_ties))
+            )
+    return np.concatenate(taus)
+
+
+def _kendall_row(ranks, i, others, complete):
+    """Tau of column ``i`` with the columns ``others``, pairwise complete."""
+    x = ranks[i]
+    if complete[i]:
+        batch = others[complete[others]]
+        taus = dict(zip(batch, _kendall_against(x, ranks[batch]), strict=True))
+    else:
+        taus = {}
+    for j in others:
+        if j not in taus:
+            rows = (x >= 0) & (ranks[j] >= 0)
+            taus[j] = _kendall_against(x[rows], ranks[j][None, rows])[0]
+    return [taus[j] for j in others]
+
+
+def _kendall(X, max_workers=DEFAULT_MAX_WORKERS):
+    """Kendall matrix of the columns of ``X``, one row of pairs per task."""
+    p = X.shape[1]
+    ranks = _dense_rank(X)
+    complete = (ranks >= 0).all(axis=1)
+    out = np.eye(p)
+    tasks = [(i, np.arange(i + 1, p)) for i in range(p - 1)]
+
+    def run(task):
+        i, others = task
+        out[i, others] = out[others, i] = _kendall_row(ranks, i, others, complete)
+
+    _run_tasks(run, tasks, max_workers)
+    return out
+
+
+def correlation_matrix(
+    data, method="pearson", block_columns=BLOCK_COLUMNS, max_workers=DEFAULT_MAX_WORKERS
+):
+    """
+    Pairwise-complete correlation matrix, like ``DataFrame.corr``.
+
+    Pearson standardizes every column once and multiplies column blocks in
+    parallel, switching to masked counts only for blocks with missing
+    values. Spearman ranks every column once and reuses the Pearson path,
+    so with missing values its ranks span each column's observed values
+    rather than each pair's. Kendall's tau-b is computed in O(n log n) per
+    pair.
+
+    Args:
+        data (pd.DataFrame): Numeric columns.
+        method (str): One of ``METHODS``.
+        block_columns (int): Columns per matrix-product block.
+        max_workers (int): Upper bound on concurrent blocks.
+
+    Returns:
+        pd.DataFrame: Square correlation matrix.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    X = data.to_numpy(dtype=np.float64)
+    if method == "kendall":
+        values = _kendall(X, max_workers)
+    else:
+        X = _rank(X) if method == "spearman" else X
+        values = _pearson(X, block_columns=block_columns, max_workers=max_workers)
+    return pd.DataFrame(values, index=data.columns, columns=data.columns)
+
+
+def correlation_with(data, target, method="pearson"):
+    """
+    Correlation of every column with a target, for feature selection.
+
+    Args:
+        data (pd.DataFrame): Numeric candidate features.
+        target (pd.Series): Numeric target.
+        method (str): One of ``METHODS``.
+
+    Returns:
+        pd.Series: Correlation of each feature with ``target``.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    X = data.to_numpy(dtype=np.float64)
+    y = target.to_numpy(dtype=np.float64)[:, None]
+    if method == "kendall":
+        ranks = _dense_rank(np.column_stack([y, X]))
+        complete = (ranks >= 0).all(axis=1)
+        values = _kendall_row(ranks, 0, np.arange(1, len(ranks)), complete)
+    else:
+        if method == "spearman":
+            X, y = _rank(X), _rank(y)
+        values = _pearson(X, y)[:, 0]
+    return pd.Series(values, index=data.columns, name=target.name)
+
+
+@memoize(key=lambda df, file_hash, method: (file_hash, method), max_entries=8)
+def frame_correlation(df, file_hash, method):
+    """``correlation_matrix`` of a parsed upload, cached by file hash."""
+    return correlation_matrix(df.select_dtypes(include="number"), method)
+
+
+class PearsonAccumulator:
+    """
+    Pairwise-complete Pearson correlation over a stream of row chunks.
+
+    Every chunk adds, for each pair of columns, the count, sums, squared
+    sums and cross products over the rows where both are present. Chunks
+    without missing values need only the cross products; the others use
+    matrix products of the zero-filled values and the presence masks.
+    Values are standardized with the first chunk's moments to avoid
+    cancellation.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        p = len(self.names)
+        self.shift = self.scale = None
+        self.n = np.zeros((p, p))
+        self.sx = np.zeros((p, p))
+        self.sxx = np.zeros((p, p))
+        self.sxy = np.zeros((p, p))
+
+    def update(self, chunk):
+        if not self.names or chunk.empty:
+            return
+        values = chunk[self.names].to_numpy(dtype=np.float64)
+        # Infinite values turn the sums of their column into inf or NaN
+        with np.errstate(invalid="ignore", over="ignore"):
+            self._add(values)
+
+    def _add(self, values):
+        if self.shift is None:
+            self.shift = np.nan_to_num(np.nanmean(values, axis=0))
+            std = np.nan_to_num(np.nanstd(values, axis=0))
+            self.scale = np.where(std > 0, std, 1.0)
+        values = (values - self.shift) / self.scale
+        present = ~np.isnan(values)
+        if present.all():
+            self.n += len(values)
+            # sx[i, j] sums column i over the rows where column j is present
+            self.sx += values.sum(axis=0)[:, None]
+            self.sxx += (values**2).sum(axis=0)[:, None]
+            self.sxy += values.T @ values
+            return
+        filled = np.where(present, values, 0.0)
+        mask = present.astype(np.float64)
+        self.n += mask.T @ mask
+        self.sx += filled.T @ mask
+        self.sxx += (filled**2).T @ mask
+        self.sxy += filled.T @ filled
+
+    def merge(self, other):
+        """Add another accumulator's moments, standardized the same way."""
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.shift, self.scale = other.shift, other.scale
+        with np.errstate(invalid="ignore", over="ignore"):
+            self._add_moments(other)
+
+    def _add_moments(self, other):
+        ratio = other.scale / self.scale
+        delta = (other.shift - self.shift) / self.scale
+        # Move the other's moments onto this accumulator's standardization
+        sx = other.sx * ratio[:, None] + delta[:, None] * other.n
+        self.sxx += (
+            other.sxx * ratio[:, None] ** 2
+            + 2 * delta[:, None] * ratio[:, None] * other.sx
+            + delta[:, None] ** 2 * other.n
+        )
+        self.sxy += (
+            np.outer(ratio, ratio) * other.sxy
+            + ratio[:, None] * other.sx * delta[None, :]
+            + (ratio[:, None] * other.sx).T * delta[:, None]
+            + np.outer(delta, delta) * other.n
+        )
+        self.sx += sx
+        self.n += other.n
+
+    def matrix(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = self.sxy - self.sx * self.sx.T / self.n
+            var = self.sxx - self.sx**2 / self.n
+            corr = cov / np.sqrt(var * var.T)
+        flat = var <= CONSTANT_TOL * self.sxx
+        corr[(self.n < 2) | flat | flat.T] = np.nan
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.names, columns=self.names)
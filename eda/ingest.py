@@ -0,0 +1,327 @@
+"""
+CSV Ingestion - Chunked, memory-lean loading for the Data Exploration page
+Numeric columns are downcast without loss, low-cardinality strings become
+categories and the parsed frame is cached once per file content. Files too
+large for memory are converted once to Parquet and streamed in batches
+"""
+
+import io
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from caching import content_hash, memoize
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+CHUNK_ROWS = 250_000
+# Upper bound on the float64 size of one streamed batch
+BATCH_BYTES = 128 * 1024**2
+# The CSV reader parses dozens of blocks ahead, so blocks are kept small
+CSV_BLOCK_BYTES = 4 * 1024**2
+PARQUET_CACHE_DIR = Path(tempfile.gettempdir()) / "stats-calculator-parquet"
+# Converted files kept on disk, least recently used are removed first
+PARQUET_CACHE_ENTRIES = 4
+PARQUET_SUFFIXES = (".parquet", ".pq")
+DATA_SUFFIXES = (".csv", *PARQUET_SUFFIXES)
+# Server directory whose files may be profiled out of core, unset disables it
+DATA_DIR_ENV = "STATS_CALCULATOR_DATA_DIR"
+# Strings become categories when distinct values are at most this share of rows
+CATEGORY_RATIO = 0.5
+
+
+def downcast_frame(df, category_ratio=CATEGORY_RATIO):
+    """
+    Shrink a frame's dtypes in place of the pandas defaults.
+
+    Integers and floats are downcast to the smallest type that holds every
+    value exactly, and string columns with few distinct values are stored
+    as ``category``.
+
+    Args:
+        df (pd.DataFrame): Frame to shrink.
+        category_ratio (float): Largest distinct-to-row ratio for categories.
+
+    Returns:
+        pd.DataFrame: Frame with compact dtypes.
+    """
+    columns = {}
+    for name, col in df.items():
+        kind = col.dtype.kind
+        if kind in "iu":
+            col = pd.to_numeric(col, downcast="integer" if kind == "i" else "unsigned")
+        elif kind == "f" and col.dtype != np.float32:
+            # pandas would round to float32, keep float64 unless exact
+            narrow = col.astype(np.float32)
+            if np.array_equal(
+                narrow.to_numpy(np.float64), col.to_numpy(), equal_nan=True
+            ):
+                col = narrow
+        elif kind == "O" and col.nunique() <= category_ratio * len(col):
+            col = col.astype("category")
+        columns[name] = col
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _merge_column(parts, n_rows, category_ratio):
+    """Concatenate one column's chunks, unifying categories where possible."""
+    if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+        merged = union_categoricals(parts, ignore_order=True)
+        if len(merged.categories) <= category_ratio * n_rows:
+            return pd.Series(merged, name=parts[0].name)
+        return pd.Series(merged.astype(object), name=parts[0].name)
+    if any(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+        parts = [part.astype(object) for part in parts]
+    return pd.concat(parts, ignore_index=True)
+
+
+@memoize(
+    key=lambda data, file_hash, engine="c", chunk_rows=CHUNK_ROWS: (
+        file_hash,
+        engine,
+        chunk_rows,
+    ),
+    max_entries=4,
+    resource=True,
+)
+def load_csv(data, file_hash, engine="c", chunk_rows=CHUNK_ROWS):
+    """
+    Parse CSV bytes into a compact DataFrame, cached by content hash.
+
+    Both engines shrink every chunk before the next is read, so the
+    default-dtype frame never exists in full. The C engine reads
+    ``chunk_rows`` rows at a time, the pyarrow engine parses blocks of
+    ``CSV_BLOCK_BYTES`` with multiple threads and hands files whose later
+    blocks contradict the first one to the C engine. The cached frame is shared
+    between reruns and sessions and must be treated as read-only.
+
+    Args:
+        data (bytes): Raw file contents.
+        file_hash (str): ``content_hash`` of ``data``, computed once by the
+            caller so reruns do not rescan the bytes.
+        engine (str): ``"c"`` or ``"pyarrow"``.
+        chunk_rows (int): Rows per chunk for the C engine.
+
+    Returns:
+        tuple: Parsed frame with downcast dtypes and its size in bytes,
+            measured once here rather than on every rerun.
+    """
+    chunks = _arrow_chunks(data) if engine == "pyarrow" else None
+    if chunks is None:
+        chunks = [
+            downcast_frame(chunk)
+            for chunk in pd.read_csv(io.BytesIO(data), chunksize=chunk_rows)
+        ]
+    if len(chunks) == 1:
+        df = chunks[0]
+    else:
+        n_rows = sum(len(chunk) for chunk in chunks)
+        df = pd.DataFrame(
+            {
+                name: _merge_column(
+                    [chunk[name] for chunk in chunks], n_rows, CATEGORY_RATIO
+                )
+                for name in chunks[0].columns
+            }
+        )
+    return df, int(df.memory_usage(deep=True).sum())
+
+
+def _arrow_frame(batch):
+    """Downcast frame of a parsed block, empty columns as floats like pandas."""
+    empty = [field.name for field in batch.schema if pa.types.is_null(field.type)]
+    return downcast_frame(batch.to_pandas().astype(dict.fromkeys(empty, np.float64)))
+
+
+def _arrow_chunks(data):
+    """Downcast frames of the CSV blocks parsed by pyarrow, None on a type clash."""
+    try:
+        return [_arrow_frame(batch) for batch in _open_csv(pa.BufferReader(data))]
+    except pa.ArrowInvalid:
+        # A later block contradicts the types inferred from the first one,
+        # the pandas reader infers them per column instead
+        return None
+
+
+def batch_rows(n_columns, batch_bytes=BATCH_BYTES):
+    """Rows per batch so that ``n_columns`` float64 columns fit the budget."""
+    return max(1_000, min(CHUNK_ROWS, batch_bytes // (8 * max(n_columns, 1))))
+
+
+def data_root():
+    """Directory of server files open to the EDA page, or None if unset."""
+    root = os.environ.get(DATA_DIR_ENV, "").strip()
+    return Path(root).resolve() if root else None
+
+
+def resolve_data_path(name, root):
+    """
+    Resolve a user-supplied file name inside the data directory.
+
+    Args:
+        name (str): Path relative to ``root``.
+        root (Path): Resolved data directory.
+
+    Returns:
+        Path: Resolved path of an existing CSV or Parquet file.
+
+    Raises:
+        ValueError: If the path leaves ``root`` or is not a data file.
+    """
+    # Resolving follows ".." and symlinks before the containment check
+    path = (root / name).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"{name} is outside the data directory")
+    if path.suffix.lower() not in DATA_SUFFIXES or not path.is_file():
+        raise ValueError(f"{name} is not a CSV or Parquet file in the data directory")
+    return path
+
+
+def file_signature(path):
+    """Hash of a file's resolved path, size and modification time."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return content_hash(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+
+def _open_csv(source, column_types=None):
+    """Streaming CSV reader whose types are inferred from the first block."""
+    return pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types, strings_can_be_null=True
+        ),
+    )
+
+
+def _stream_csv(source, target, column_types=None):
+    """Write a CSV to Parquet one block at a time."""
+    reader = _open_csv(source, column_types)
+    with pq.ParquetWriter(target, reader.schema) as writer:
+        for batch in reader:
+            # One row group per block, write_batch would buffer the whole file
+            writer.write_table(pa.Table.from_batches([batch]))
+
+
+def _widened_types(source):
+    """
+    Types for a second pass when a later block contradicts the first one.
+
+    Integer columns become float64 and columns empty in the first block are
+    read as strings, which hold any value.
+    """
+    widened = {}
+    for field in _open_csv(source).schema:
+        if pa.types.is_integer(field.type):
+            widened[field.name] = pa.float64()
+        elif pa.types.is_null(field.type):
+            widened[field.name] = pa.string()
+    return widened
+
+
+def _convert_csv(source, target):
+    """Stream a CSV to Parquet, widening column types if a block needs it."""
+    try:
+        _stream_csv(source, target)
+    except pa.ArrowInvalid:
+        _stream_csv(source, target, _widened_types(source))
+
+
+def _last_used(file):
+    try:
+        return file.stat().st_mtime
+    except FileNotFoundError:
+        # Evicted by another session in the meantime
+        return 0.0
+
+
+def _evict_parquet_cache(cache_dir, keep, max_entries):
+    """Remove the least recently used converted files beyond ``max_entries``."""
+    files = sorted(Path(cache_dir).glob("*.parquet"), key=_last_used, reverse=True)
+    for file in files[max_entries:]:
+        # Readers that already opened the file keep their handle
+        if file != keep:
+            file.unlink(missing_ok=True)
+
+
+def csv_to_parquet(
+    path, cache_dir=PARQUET_CACHE_DIR, max_entries=PARQUET_CACHE_ENTRIES
+):
+    """
+    Convert a CSV file once to a Parquet file in the on-disk cache.
+
+    The CSV is parsed block by block and each block is appended to the
+    Parquet file, so memory use does not depend on the file size. Column
+    types are inferred from the first block, integer columns are widened to
+    float64 and empty columns to strings if a later block needs it. Only the
+    ``max_entries`` most recently used conversions are kept.
+
+    Args:
+        path (str | Path): CSV file on the server.
+        cache_dir (str | Path): Directory of the converted files.
+        max_entries (int): Converted files kept in ``cache_dir``.
+
+    Returns:
+        Path: Parquet file, reused while the CSV is unchanged.
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Converting CSV files to Parquet requires pyarrow")
+    target = Path(cache_dir) / f"{file_signature(path)}.parquet"
+    try:
+        # Mark as recently used, unlike touch() this never creates the file
+        os.utime(target)
+        return target
+    except FileNotFoundError:
+        pass
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_suffix(".partial")
+    try:
+        _convert_csv(path, partial)
+    except BaseException:
+        # Do not leave half-written conversions behind
+        partial.unlink(missing_ok=True)
+        raise
+    partial.replace(target)
+    _evict_parquet_cache(cache_dir, target, max_entries)
+    return target
+
+
+def iter_file_batches(path):
+    """
+    Stream a CSV or Parquet file from disk as DataFrame batches.
+
+    CSV files go through the Parquet cache when pyarrow is installed and
+    are otherwise read with the pandas chunked reader. Batch sizes keep
+    every batch within ``BATCH_BYTES`` regardless of the number of columns.
+
+    Args:
+        path (str | Path): CSV or Parquet file on the server.
+
+    Yields:
+        pd.DataFrame: Consecutive row batches.
+    """
+    path = Path(path)
+    is_parquet = path.suffix.lower() in PARQUET_SUFFIXES
+    if is_parquet and not PYARROW_AVAILABLE:
+        raise ImportError("Reading Parquet files requires pyarrow")
+    if not PYARROW_AVAILABLE:
+        header = pd.read_csv(path, nrows=0)
+        yield from pd.read_csv(path, chunksize=batch_rows(len(header.columns)))
+        return
+
+    parquet = pq.ParquetFile(path if is_parquet else csv_to_parquet(path))
+    rows = batch_rows(len(parquet.schema_arrow))
+    for batch in parquet.iter_batches(batch_size=rows):
+        yield batch.to_pandas()
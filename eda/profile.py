@@ -0,0 +1,530 @@
+"""
+Column Profiler - Every per-column statistic of the EDA page in one pass
+Accumulators consume row chunks and merge with each other, so the same
+profile can be built from an in-memory frame or a stream of batches
+"""
+
+import tempfile
+from dataclasses import dataclass, field
+from itertools import chain, pairwise
+from pathlib import Path
+from typing import ClassVar
+
+import numpy as np
+import pandas as pd
+
+from caching import memoize
+from eda.correlation import PearsonAccumulator
+from eda.ingest import CHUNK_ROWS, batch_rows, file_signature, iter_file_batches
+from eda.sketches import HyperLogLog, KLLSketch
+
+HIST_BINS = 64
+QUANTILES = (0.25, 0.5, 0.75)
+MAX_FLIERS = 1_000
+PREVIEW_ROWS = 10
+# Top bits of a row hash that choose its spill file, 256 partitions
+SPILL_BITS = 8
+
+
+def is_numeric(dtype):
+    """Whether a column is profiled as numeric (booleans are not)."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(
+        dtype
+    )
+
+
+def hash_values(values):
+    """64-bit hashes of an array's or a Series' values, or of a frame's rows."""
+    if isinstance(values, np.ndarray):
+        return pd.util.hash_array(values)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def comparable_rows(chunk, numeric):
+    """Rows with numeric columns as float64, so int and float batches hash alike."""
+    return chunk.astype(dict.fromkeys(numeric, np.float64))
+
+
+def box_summary(values):
+    """Quartiles, whiskers at 1.5 IQR and a capped sample of fliers."""
+    q1, med, q3 = np.quantile(values, QUANTILES)
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = (values >= low) & (values <= high)
+    # An overflowing IQR can leave nothing inside, the whiskers then close the box
+    return {
+        "q1": q1,
+        "med": med,
+        "q3": q3,
+        "whislo": values[inside].min() if inside.any() else q1,
+        "whishi": values[inside].max() if inside.any() else q3,
+        "fliers": values[~inside][:MAX_FLIERS],
+    }
+
+
+@dataclass
+class Moments:
+    """Count, extremes, mean and M2 merged with the parallel Welford update."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = np.inf
+    max: float = -np.inf
+
+    def update(self, values):
+        if len(values):
+            # Infinite values make the mean infinite and M2 NaN, as in describe()
+            with np.errstate(invalid="ignore", over="ignore"):
+                chunk_mean = values.mean()
+                chunk_m2 = ((values - chunk_mean) ** 2).sum()
+            self.merge(
+                Moments(len(values), chunk_mean, chunk_m2, values.min(), values.max())
+            )
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        with np.errstate(invalid="ignore", over="ignore"):
+            delta = other.mean - self.mean
+            if np.isfinite(delta):
+                self.mean += delta * other.count / total
+                self.m2 += other.m2 + delta**2 * self.count * other.count / total
+            else:
+                # Infinite means combine like the sums they come from
+                self.mean = self.mean + other.mean
+                self.m2 = np.nan
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+
+@dataclass
+class Histogram:
+    """
+    Fixed number of equal-width bins whose range doubles as data arrives.
+
+    Growing the range merges adjacent bin pairs, so chunks can be added in
+    any order without knowing the column's extremes up front.
+    """
+
+    bins: int = HIST_BINS
+    lo: float = np.nan
+    width: float = np.nan
+    counts: np.ndarray = None
+
+    def __post_init__(self):
+        if self.counts is None:
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+
+    @property
+    def hi(self):
+        return self.lo + self.bins * self.width
+
+    def edges(self):
+        return self.lo + self.width * np.arange(self.bins + 1)
+
+    def _grow(self, low, high):
+        """Double the bin width until ``[low, high]`` fits."""
+        half = self.bins // 2
+        while low < self.lo or high > self.hi:
+            pairs = self.counts.reshape(half, 2).sum(axis=1)
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+            if low < self.lo:
+                # Extend downwards, the old range becomes the upper half
+                self.counts[half:] = pairs
+                self.lo -= self.bins * self.width
+            else:
+                self.counts[:half] = pairs
+            self.width *= 2
+
+    def _add(self, values, weights=None):
+        idx = ((values - self.lo) / self.width).astype(np.int64)
+        idx = np.clip(idx, 0, self.bins - 1)
+        counts = np.bincount(idx, weights=weights, minlength=self.bins)
+        self.counts += counts.astype(np.int64)
+
+    def update(self, values):
+        if not len(values):
+            return
+        low, high = values.min(), values.max()
+        if np.isnan(self.lo):
+            self.lo = low
+            self.width = (high - low) / self.bins or max(abs(low), 1.0) * 1e-9
+        self._grow(low, high)
+        self._add(values)
+
+    def merge(self, other):
+        if np.isnan(other.lo):
+            return
+        if np.isnan(self.lo):
+            self.lo, self.width = other.lo, other.width
+            self.counts = other.counts.copy()
+            return
+        # Re-bin the other histogram by bin centre onto this grid
+        centres = other.edges()[:-1] + other.width / 2
+        self._grow(centres[0], centres[-1])
+        self._add(centres, other.counts)
+
+
+@dataclass
+class ExactQuantiles:
+    """Keeps every value so quartiles and box-plot whiskers are exact."""
+
+    parts: list = field(default_factory=list)
+
+    def update(self, values):
+        if len(values):
+            self.parts.append(values)
+
+    def merge(self, other):
+        self.parts.extend(other.parts)
+
+    def summary(self):
+        return box_summary(np.concatenate(self.parts))
+
+
+@dataclass
+class SketchQuantiles:
+    """Quartiles and box-plot statistics from a KLL sketch."""
+
+    sketch: KLLSketch = field(default_factory=KLLSketch)
+
+    def update(self, values):
+        self.sketch.update(values)
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+
+    def summary(self):
+        """Box-plot statistics, with whiskers and fliers from retained items."""
+        box = box_summary(self.sketch.items()[0])
+        box["q1"], box["med"], box["q3"] = self.sketch.quantiles(QUANTILES)
+        return box
+
+    def rank_error(self):
+        return self.sketch.rank_error()
+
+
+@dataclass
+class ExactDistinct:
+    """Distinct count from the set of 64-bit value hashes."""
+
+    parts: list = field(default_factory=list)
+
+    def update(self, hashes):
+        if len(hashes):
+            self.parts.append(np.unique(hashes))
+
+    def merge(self, other):
+        self.parts.extend(other.parts)
+
+    def estimate(self):
+        hashes = np.concatenate(self.parts) if self.parts else np.empty(0)
+        self.parts = []
+        distinct = count_sorted_distinct(hashes)
+        self.parts = [hashes]
+        return distinct
+
+
+def count_sorted_distinct(hashes):
+    """Sort hashes in place and count boundaries, instead of np.unique's copies."""
+    hashes.sort()
+    return int(len(hashes) > 0) + int(np.count_nonzero(hashes[1:] != hashes[:-1]))
+
+
+@dataclass
+class SpilledDistinct:
+    """
+    Exact distinct count of 64-bit hashes spilled to files on disk.
+
+    Every update appends its distinct hashes to one file per partition of
+    their top bits, so equal hashes share a file and counting reads one
+    partition at a time.
+    """
+
+    directory: Path
+
+    def _file(self, partition):
+        return self.directory / f"{partition:03d}.u64"
+
+    def update(self, hashes):
+        hashes = np.unique(hashes)
+        # Sorted hashes of one partition are contiguous
+        bounds = np.arange(1, 2**SPILL_BITS, dtype=np.uint64) << np.uint64(
+            64 - SPILL_BITS
+        )
+        starts = np.r_[0, np.searchsorted(hashes, bounds), len(hashes)]
+        for partition, (start, stop) in enumerate(pairwise(starts)):
+            if stop > start:
+                with self._file(partition).open("ab") as file:
+                    hashes[start:stop].tofile(file)
+
+    def estimate(self):
+        return sum(
+            count_sorted_distinct(np.fromfile(file, dtype=np.uint64))
+            for file in self.directory.glob("*.u64")
+        )
+
+
+@dataclass
+class ColumnAccumulator:
+    """All statistics of one column, updated chunk by chunk."""
+
+    # Whether estimates carry error bounds in the column table
+    approximate: ClassVar[bool] = False
+
+    name: str
+    dtype: str
+    numeric: bool
+    rows: int = 0
+    nulls: int = 0
+    distinct: ExactDistinct = field(default_factory=ExactDistinct)
+    moments: Moments = field(default_factory=Moments)
+    histogram: Histogram = field(default_factory=Histogram)
+    quantiles: ExactQuantiles = field(default_factory=ExactQuantiles)
+
+    def update(self, series):
+        present = series.dropna()
+        self.rows += len(series)
+        self.nulls += len(series) - len(present)
+        if not self.numeric:
+            self.distinct.update(hash_values(present))
+        else:
+            # Hash numbers as float64 so int and float batches of a column agree
+            values = present.to_numpy(dtype=np.float64)
+            self.distinct.update(hash_values(values))
+            self.moments.update(values)
+            # Infinities count towards the moments, as in describe(), but
+            # would break the bin edges and the whiskers
+            finite = values[np.isfinite(values)]
+            self.histogram.update(finite)
+            self.quantiles.update(finite)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if self.numeric:
+            self.moments.merge(other.moments)
+            self.histogram.merge(other.histogram)
+            self.quantiles.merge(other.quantiles)
+
+    def finalize(self):
+        """Table row, histogram and box-plot statistics of the column."""
+        record = {
+            "Column": self.name,
+            "Type": self.dtype,
+            "Numeric": self.numeric,
+            "Non-Null": self.rows - self.nulls,
+            "Null": self.nulls,
+            "Unique": self.distinct.estimate(),
+        }
+        if self.approximate:
+            record["Unique ±"] = round(self.distinct.error())
+        if not self.numeric:
+            return record, None, None
+        # The other statistics of an all-null column are left missing
+        record["count"] = self.moments.count
+        if np.isnan(self.histogram.lo):
+            # No finite values, so no quartiles, histogram or box plot
+            if self.moments.count:
+                moments = self.moments
+                record.update(mean=moments.mean, min=moments.min, max=moments.max)
+            return record, None, None
+        box = self.quantiles.summary()
+        record.update(
+            {
+                "mean": self.moments.mean,
+                "std": self.moments.std,
+                "min": self.moments.min,
+                "25%": box["q1"],
+                "50%": box["med"],
+                "75%": box["q3"],
+                "max": self.moments.max,
+            }
+        )
+        if self.approximate:
+            record["Quantile ±"] = f"{self.quantiles.rank_error():.1%} of rows"
+        return record, (self.histogram.counts, self.histogram.edges()), box
+
+
+@dataclass
+class SketchColumnAccumulator(ColumnAccumulator):
+    """
+    Column statistics in fixed memory, with HyperLogLog distinct counts and
+    KLL quantiles whose error bounds are reported next to the estimates.
+    """
+
+    approximate: ClassVar[bool] = True
+
+    distinct: HyperLogLog = field(default_factory=HyperLogLog)
+    quantiles: SketchQuantiles = field(default_factory=SketchQuantiles)
+
+
+@dataclass
+class FrameProfile:
+    """Everything the EDA page renders, built from one pass over the data."""
+
+    rows: int
+    columns: pd.DataFrame
+    histograms: dict
+    boxes: dict
+    duplicate_rows: int
+    correlation: pd.DataFrame
+    preview: pd.DataFrame
+
+    @property
+    def numeric_columns(self):
+        return self.columns.index[self.columns["Numeric"]].tolist()
+
+    @property
+    def missing(self):
+        """Null counts of columns with missing values, largest first."""
+        nulls = self.columns["Null"]
+        return nulls[nulls > 0].sort_values(ascending=False)
+
+    def _with_errors(self, names, error):
+        return names + [error] if error in self.columns else names
+
+    def column_info(self):
+        """Types, null counts and distinct counts of every column."""
+        names = ["Column", "Type", "Non-Null", "Null", "Unique"]
+        return self.columns[self._with_errors(names, "Unique ±")]
+
+    def describe(self):
+        """Summary statistics of the numeric columns, like ``describe().T``."""
+        stats = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+        stats = self._with_errors(stats, "Quantile ±")
+        return self.columns.reindex(columns=stats).loc[self.numeric_columns]
+
+
+def build_profile(columns, rows, duplicate_rows, pearson, preview):
+    """Assemble finalized column statistics into a ``FrameProfile``."""
+    records, histograms, boxes = [], {}, {}
+    for record, histogram, box in columns:
+        records.append(record)
+        if histogram is not None:
+            histograms[record["Column"]] = histogram
+            boxes[record["Column"]] = box
+    table = pd.DataFrame.from_records(records, columns=["Column", "Type", "Numeric"])
+    table = pd.DataFrame.from_records(records) if records else table
+    return FrameProfile(
+        rows,
+        table.set_index("Column", drop=False),
+        histograms,
+        boxes,
+        duplicate_rows,
+        pearson.matrix(),
+        preview,
+    )
+
+
+def iter_chunks(frame, chunk_rows=CHUNK_ROWS):
+    """Row slices of an in-memory frame or series."""
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start : start + chunk_rows]
+
+
+def profile_chunks(chunks, accumulator=ColumnAccumulator):
+    """
+    Profile a stream of row chunks, updating every accumulator per chunk.
+
+    Column names and types are taken from the first chunk. Duplicate rows
+    are counted exactly from 8-byte row hashes spilled to a temporary
+    directory, so memory does not grow with the number of rows.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Row chunks with the same columns.
+        accumulator (type): Per-column accumulator class.
+
+    Returns:
+        FrameProfile: Profile of the concatenated chunks.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, pd.DataFrame())
+    columns = [
+        accumulator(name, str(dtype), is_numeric(dtype))
+        for name, dtype in first.dtypes.items()
+    ]
+    numeric = [col.name for col in columns if col.numeric]
+    pearson = PearsonAccumulator(numeric)
+    rows = 0
+    with tempfile.TemporaryDirectory(prefix="stats-calculator-rows-") as spill:
+        row_hashes = SpilledDistinct(Path(spill))
+        for chunk in chain([first], chunks):
+            for col in columns:
+                col.update(chunk[col.name])
+            row_hashes.update(hash_values(comparable_rows(chunk, numeric)))
+            pearson.update(chunk)
+            rows += len(chunk)
+        duplicates = rows - row_hashes.estimate()
+    finalized = [col.finalize() for col in columns]
+    preview = first.head(PREVIEW_ROWS)
+    return build_profile(finalized, rows, duplicates, pearson, preview)
+
+
+@memoize(
+    key=lambda df, file_hash, engine="c", approximate=False: (
+        file_hash,
+        engine,
+        approximate,
+    ),
+    max_entries=8,
+)
+def profile_frame(df, file_hash, engine="c", approximate=False):
+    """
+    Profile an in-memory frame, cached by the hash of the upload.
+
+    Columns are profiled one at a time so only one column's values are
+    held by the quantile accumulator, then a single pass over row chunks
+    gathers duplicate rows and pairwise correlations.
+
+    Args:
+        df (pd.DataFrame): Parsed upload.
+        file_hash (str): ``content_hash`` of the uploaded bytes.
+        engine (str): Engine ``df`` was parsed with, which decides its dtypes.
+        approximate (bool): Estimate distinct counts and quartiles with
+            sketches and report their error bounds.
+
+    Returns:
+        FrameProfile: Profile of ``df``.
+    """
+    accumulator = SketchColumnAccumulator if approximate else ColumnAccumulator
+    finalized = []
+    for name, dtype in df.dtypes.items():
+        col = accumulator(name, str(dtype), is_numeric(dtype))
+        for chunk in iter_chunks(df[name]):
+            col.update(chunk)
+        finalized.append(col.finalize())
+
+    numeric = [record["Column"] for record, _, _ in finalized if record["Numeric"]]
+    pearson = PearsonAccumulator(numeric)
+    row_hashes = ExactDistinct()
+    for chunk in iter_chunks(df, batch_rows(df.shape[1])):
+        row_hashes.update(hash_values(comparable_rows(chunk, numeric)))
+        pearson.update(chunk)
+    duplicates = len(df) - row_hashes.estimate()
+    return build_profile(finalized, len(df), duplicates, pearson, df.head(PREVIEW_ROWS))
+
+
+@memoize(key=lambda path: file_signature(path), max_entries=4)
+def profile_file(path):
+    """
+    Profile a CSV or Parquet file on disk without loading it into memory.
+
+    The file is streamed in batches and every column keeps fixed-size
+    sketches for distinct counts and quartiles. The profile is cached until
+    the file changes.
+
+    Args:
+        path (str | Path): CSV or Parquet file on the server.
+
+    Returns:
+        FrameProfile: Profile of the file.
+    """
+    return profile_chunks(iter_file_batches(path), SketchColumnAccumulator)
@@ -0,0 +1,175 @@
+"""
+Streaming Sketches - Distinct counts and quantiles in fixed memory
+HyperLogLog and KLL sketches absorb values in batches and merge with
+sketches of other chunks
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+HLL_PRECISION = 14
+KLL_K = 200
+# Multiplier of the standard error for the reported bounds, about 99%
+CONFIDENCE_Z = 2.576
+
+
+def _leading_zeros(words):
+    """Leading zero bits of each uint64, by binary search on the bit width."""
+    zeros = np.zeros(len(words), dtype=np.int64)
+    words = words.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = words < np.uint64(1 << (64 - shift))
+        zeros += empty * shift
+        words = np.where(empty, words << np.uint64(shift), words)
+    return zeros + (words == 0)
+
+
+def _sigma(x):
+    """Series of Ertl's estimator for the share of empty registers."""
+    if x == 1:
+        return np.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    """Series of Ertl's estimator for the share of saturated registers."""
+    if x in (0, 1):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = np.sqrt(x)
+        y *= 0.5
+        previous, z = z, z - (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+@dataclass
+class HyperLogLog:
+    """
+    Distinct count from 64-bit hashes in ``2**precision`` one-byte registers.
+
+    Each hash picks a register with its top bits and records the position
+    of the first set bit in the rest. Merging takes the register-wise
+    maximum, so a sketch of the union equals the merge of the sketches.
+    """
+
+    precision: int = HLL_PRECISION
+    registers: np.ndarray = None
+
+    def __post_init__(self):
+        if self.registers is None:
+            self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        if not len(hashes):
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = hashes << np.uint64(self.precision)
+        rank = np.minimum(_leading_zeros(rest), 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self):
+        """
+        Ertl's improved raw estimator, computed from the register histogram.
+
+        Unlike the classic estimator with a switch to linear counting, it
+        has no bias bump at small and medium cardinalities, so the error
+        bound holds across the whole range.
+        """
+        m = len(self.registers)
+        q = 64 - self.precision
+        counts = np.bincount(self.registers, minlength=q + 2)
+        z = m * _tau(1 - counts[q + 1] / m)
+        for rank in range(q, 0, -1):
+            z = 0.5 * (z + counts[rank])
+        z += m * _sigma(counts[0] / m)
+        return round(m**2 / (2 * np.log(2)) / z)
+
+    def error(self):
+        """Absolute error bound of ``estimate``."""
+        return CONFIDENCE_Z * 1.04 / np.sqrt(len(self.registers)) * self.estimate()
+
+
+@dataclass
+class KLLSketch:
+    """
+    Quantile sketch of Karnin, Lang and Liberty with compactor levels.
+
+    Level ``h`` holds items of weight ``2**h``. A level over its capacity
+    is sorted and every other item, from a random offset, moves up a level.
+    Capacities shrink geometrically towards the lower levels, so the sketch
+    keeps about ``3 k`` items however many values it has seen.
+    """
+
+    k: int = KLL_K
+    count: int = 0
+    levels: list = field(default_factory=lambda: [np.empty(0)])
+    rng: np.random.Generator = field(default_factory=np.random.default_rng)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                # An odd item stays behind so total weight is preserved
+                odd = len(items) % 2
+                promoted = items[odd:][self.rng.integers(2) :: 2]
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], promoted]
+                )
+                self.levels[level] = items[:odd]
+                # Growing the top lowers every capacity, so start over
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values):
+        if len(values):
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.count += len(values)
+            self._compress()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def items(self):
+        """Retained items, sorted, and their weights."""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2.0**level) for level, items in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantiles(self, qs):
+        values, weights = self.items()
+        ranks = np.cumsum(weights) / weights.sum()
+        idx = np.searchsorted(ranks, np.asarray(qs), side="left")
+        return values[np.minimum(idx, len(values) - 1)]
+
+    def rank_error(self):
+        """Normalized rank error bound of a single quantile."""
+        return 2.296 / self.k**0.9723
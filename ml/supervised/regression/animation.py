@@ -0,0 +1,168 @@
+"""
+Gradient Descent Animation - One Plotly figure for a whole trajectory
+Every step is a frame that only carries the traces that move, so the
+browser plays and scrubs the animation without rerunning the script
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from ml.supervised.regression.descent import loss_surface
+
+# The surface only needs enough detail for smooth contours in the browser
+ANIMATION_SURFACE_RESOLUTION = 120
+# Trace indices updated by each frame: fitted line, cost curve, descent path
+MOVING_TRACES = [1, 2, 4]
+
+
+def _step_traces(X_ends, history, cost_history, i):
+    """Fitted line, cost curve and descent path up to step ``i``."""
+    m, b = history[i]
+    path = np.vstack([[0.0, 0.0], history[: i + 1]])
+    return [
+        go.Scatter(x=X_ends, y=m * X_ends + b),
+        go.Scatter(x=np.arange(1, i + 2), y=cost_history[: i + 1]),
+        go.Scatter(x=path[:, 0], y=path[:, 1]),
+    ]
+
+
+def _step_title(history, cost_history, i):
+    m, b = history[i]
+    return f"Step {i + 1}: y = {m:.2f}x + {b:.2f}   (MSE {cost_history[i]:.4f})"
+
+
+def gradient_descent_animation(X, y, history, cost_history, frame_duration=60):
+    """
+    Build an animated figure of a single-feature gradient descent run.
+
+    The data, the full cost axis and the loss-surface contour are sent once.
+    Frames only update the fitted line, the cost curve and the path on the
+    surface, and a slider lets the user scrub through the steps client-side.
+
+    Args:
+        X (np.ndarray): ``(n,)`` feature values.
+        y (np.ndarray): ``(n,)`` targets.
+        history (np.ndarray): ``(iterations, 2)`` (m, b) after each update.
+        cost_history (np.ndarray): ``(iterations,)`` cost before each update.
+        frame_duration (int): Milliseconds per frame when playing.
+
+    Returns:
+        go.Figure: Figure with one frame per step.
+    """
+    history = np.asarray(history)
+    cost_history = np.asarray(cost_history)
+    X_ends = np.array([X.min(), X.max()])
+    m_axis, b_axis, surface = loss_surface(X, y, ANIMATION_SURFACE_RESOLUTION)
+
+    fig = make_subplots(
+        rows=1,
+        cols=3,
+        subplot_titles=("Regression Line", "Cost (MSE)", "Loss Surface J(m, b)"),
+    )
+    line, cost, path = _step_traces(X_ends, history, cost_history, 0)
+    fig.add_trace(
+        go.Scatter(
+            x=X, y=y, mode="markers", name="Data Points", marker={"color": "blue"}
+        ),
+        row=1,
+        col=1,
+    )
+    fig.add_trace(
+        line.update(mode="lines", name="Regression Line", line={"color": "red"}),
+        row=1,
+        col=1,
+    )
+    fig.add_trace(
+        cost.update(mode="lines", name="Cost", line={"color": "orange"}),
+        row=1,
+        col=2,
+    )
+    fig.add_trace(
+        go.Contour(
+            x=m_axis,
+            y=b_axis,
+            z=np.log10(surface),
+            colorscale="Viridis",
+            contours={"coloring": "lines"},
+            showscale=False,
+            hoverinfo="skip",
+            name="log10 MSE",
+        ),
+        row=1,
+        col=3,
+    )
+    fig.add_trace(
+        path.update(mode="lines+markers", name="Path", line={"color": "red"}),
+        row=1,
+        col=3,
+    )
+
+    fig.frames = [
+        go.Frame(
+            data=_step_traces(X_ends, history, cost_history, i),
+            traces=MOVING_TRACES,
+            name=str(i),
+            layout={"title": {"text": _step_title(history, cost_history, i)}},
+        )
+        for i in range(len(history))
+    ]
+
+    playback = {
+        "frame": {"duration": frame_duration, "redraw": False},
+        "transition": {"duration": 0},
+        "fromcurrent": True,
+    }
+    scrub = {
+        "mode": "immediate",
+        "frame": {"duration": 0, "redraw": False},
+        "transition": {"duration": 0},
+    }
+    fig.update_layout(
+        title={"text": _step_title(history, cost_history, 0)},
+        showlegend=False,
+        height=420,
+        margin={"t": 90},
+        updatemenus=[
+            {
+                "type": "buttons",
+                "direction": "left",
+                "x": 0,
+                "y": -0.15,
+                "xanchor": "left",
+                "buttons": [
+                    {"label": "▶ Play", "method": "animate", "args": [None, playback]},
+                    {
+                        "label": "⏸ Pause",
+                        "method": "animate",
+                        "args": [[None], scrub],
+                    },
+                ],
+            }
+        ],
+        sliders=[
+            {
+                "x": 0.15,
+                "y": -0.1,
+                "len": 0.85,
+                "currentvalue": {"prefix": "Step "},
+                "steps": [
+                    {
+                        "label": str(i + 1),
+                        "method": "animate",
+                        "args": [[str(i)], scrub],
+                    }
+                    for i in range(len(history))
+                ],
+            }
+        ],
+    )
+    fig.update_xaxes(title_text="X", row=1, col=1)
+    fig.update_yaxes(title_text="Y", range=[0, max(y) + 2], row=1, col=1)
+    fig.update_xaxes(title_text="Iteration", range=[0, len(history) + 1], row=1, col=2)
+    fig.update_yaxes(
+        title_text="Loss", range=[0, cost_history.max() * 1.05], row=1, col=2
+    )
+    fig.update_xaxes(title_text="m (slope)", row=1, col=3)
+    fig.update_yaxes(title_text="b (intercept)", row=1, col=3)
+    return fig
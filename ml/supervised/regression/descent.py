@@ -0,0 +1,170 @@
+"""
+Gradient Descent Engine - Trajectories for least-squares regression
+The data enter only through their sufficient statistics, so after one pass
+over the rows every full-batch step and every cost evaluation is
+independent of the number of samples
+"""
+
+import numpy as np
+
+from caching import content_hash, memoize
+
+OPTIMIZERS = ["Gradient Descent", "Momentum", "Adam"]
+SURFACE_RESOLUTION = 500
+
+
+def sufficient_statistics(X, y):
+    """
+    Moments that determine the MSE of every linear model on ``(X, y)``.
+
+    With the design matrix ``A = [X, 1]`` the cost is
+    ``J(theta) = theta' G theta - 2 theta' c + s`` where ``G = A'A / n``,
+    ``c = A'y / n`` and ``s = y'y / n``. For a single feature these hold
+    the sums of x, y, x^2, xy and y^2.
+
+    Args:
+        X (np.ndarray): ``(n,)`` or ``(n, d)`` features.
+        y (np.ndarray): ``(n,)`` targets.
+
+    Returns:
+        dict: ``gram``, ``moment``, ``y_sq`` and the sample count ``n``.
+    """
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    y = np.asarray(y, dtype=float)
+    A = np.column_stack([X, np.ones(len(y))])
+    n = len(y)
+    return {"gram": A.T @ A / n, "moment": A.T @ y / n, "y_sq": y @ y / n, "n": n}
+
+
+def mse(stats, params):
+    """
+    MSE of one or many parameter vectors from the sufficient statistics.
+
+    Args:
+        stats (dict): Output of ``sufficient_statistics``.
+        params (np.ndarray): ``(..., d + 1)`` slopes followed by the intercept.
+
+    Returns:
+        np.ndarray: Cost of every parameter vector.
+    """
+    quad = np.einsum("...i,ij,...j->...", params, stats["gram"], params)
+    return quad - 2 * params @ stats["moment"] + stats["y_sq"]
+
+
+@memoize(
+    key=lambda X, y, resolution=SURFACE_RESOLUTION: (
+        content_hash(np.asarray(X, dtype=float)),
+        content_hash(np.asarray(y, dtype=float)),
+        resolution,
+    )
+)
+def loss_surface(X, y, resolution=SURFACE_RESOLUTION):
+    """
+    MSE over an (m, b) grid for a single-feature regression.
+
+    The MSE is a quadratic form in (m, b), so the whole grid is evaluated
+    from the sufficient statistics by broadcasting, without touching the
+    rows again. The grid spans the origin, where descent starts, and the
+    least-squares solution with a margin on each side. Results are cached
+    per dataset, so changing optimizer settings only redraws the path.
+
+    Args:
+        X (np.ndarray): ``(n,)`` feature values.
+        y (np.ndarray): ``(n,)`` targets.
+        resolution (int): Grid points along each axis.
+
+    Returns:
+        tuple: ``(resolution,)`` slope and intercept axes and the
+            ``(resolution, resolution)`` MSE indexed as ``[b, m]``.
+    """
+    stats = sufficient_statistics(X, y)
+    optimum = np.linalg.lstsq(stats["gram"], stats["moment"], rcond=None)[0]
+    axes = []
+    for value in optimum:
+        low, high = min(0.0, value), max(0.0, value)
+        pad = 0.5 * (high - low) + 1.0
+        axes.append(np.linspace(low - pad, high + pad, resolution))
+    m_axis, b_axis = axes
+    grid = np.stack(np.meshgrid(m_axis, b_axis), axis=-1)
+    return m_axis, b_axis, mse(stats, grid)
+
+
+def descend(
+    stats,
+    learning_rate=0.01,
+    iterations=100,
+    optimizer="Gradient Descent",
+    batch_size=None,
+    data=None,
+    beta1=0.9,
+    beta2=0.999,
+    eps=1e-8,
+    rng=None,
+):
+    """
+    Optimize the MSE from zero and record the whole trajectory.
+
+    Full-batch gradients ``2 (G theta - c)`` come from the sufficient
+    statistics. With ``batch_size`` set, each step uses the gradient of a
+    random mini-batch of ``data`` instead, while costs are still evaluated
+    on the full dataset.
+
+    Args:
+        stats (dict): Output of ``sufficient_statistics``.
+        learning_rate (float): Step size.
+        iterations (int): Number of updates.
+        optimizer (str): One of ``OPTIMIZERS``.
+        batch_size (int | None): Mini-batch size for SGD, ``None`` for
+            full-batch steps.
+        data (tuple | None): ``(X, y)`` to draw mini-batches from.
+        beta1 (float): Momentum coefficient, also Adam's first-moment decay.
+        beta2 (float): Adam's second-moment decay.
+        eps (float): Adam's numerical stabilizer.
+        rng (np.random.Generator | None): Random generator for mini-batches.
+
+    Returns:
+        tuple: ``(iterations, d + 1)`` parameters after each update and the
+            ``(iterations,)`` cost before each update.
+    """
+    if optimizer not in OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer: {optimizer}")
+    gram, moment = stats["gram"], stats["moment"]
+    theta = np.zeros(len(moment))
+    velocity = np.zeros_like(theta)
+    second = np.zeros_like(theta)
+    params = np.empty((iterations, len(theta)))
+    costs = np.empty(iterations)
+
+    if batch_size is not None:
+        rng = np.random.default_rng() if rng is None else rng
+        X, y = data
+        A = np.column_stack(
+            [np.asarray(X, dtype=float).reshape(len(y), -1), np.ones(len(y))]
+        )
+        y = np.asarray(y, dtype=float)
+        batches = rng.integers(len(y), size=(iterations, min(batch_size, len(y))))
+
+    for t in range(iterations):
+        costs[t] = mse(stats, theta)
+        if batch_size is None:
+            grad = 2 * (gram @ theta - moment)
+        else:
+            A_b, y_b = A[batches[t]], y[batches[t]]
+            grad = 2 * A_b.T @ (A_b @ theta - y_b) / len(y_b)
+
+        if optimizer == "Gradient Descent":
+            step = grad
+        elif optimizer == "Momentum":
+            velocity = beta1 * velocity + grad
+            step = velocity
+        else:
+            velocity = beta1 * velocity + (1 - beta1) * grad
+            second = beta2 * second + (1 - beta2) * grad**2
+            v_hat = velocity / (1 - beta1 ** (t + 1))
+            s_hat = second / (1 - beta2 ** (t + 1))
+            step = v_hat / (np.sqrt(s_hat) + eps)
+
+        theta = theta - learning_rate * step
+        params[t] = theta
+
+    return params, costs
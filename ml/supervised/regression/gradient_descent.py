@@ -2,30 +2,19 @@ import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
 
+from ml.supervised.regression.descent import (
+    OPTIMIZERS,
+    descend,
+    loss_surface,
+    sufficient_statistics,
+)
+
 
 # Gradient Descent Algorithm for Linear Regression
-def gradient_descent(X, y, learning_rate=0.01, iterations=100):
-    m = 0  # Initial slope
-    b = 0  # Initial intercept
-    n = len(X)
-    history = []
-    cost_history = []
-
-    for _ in range(iterations):
-        y_pred = m * X + b
-        # Calculate gradients
-        dm = (-2 / n) * np.sum(X * (y - y_pred))
-        db = (-2 / n) * np.sum(y - y_pred)
-        # Update m and b
-        m -= learning_rate * dm
-        b -= learning_rate * db
-        # Calculate cost (mean squared error)
-        cost = np.mean((y - y_pred) ** 2)
-        # Save history of m, b, and cost
-        history.append((m, b))
-        cost_history.append(cost)
-
-    return history, cost_history
+def gradient_descent(X, y, learning_rate=0.01, iterations=100, optimizer=OPTIMIZERS[0]):
+    # Rows of history are (m, b) after each update, costs are taken before it
+    stats = sufficient_statistics(X, y)
+    return descend(stats, learning_rate, iterations, optimizer=optimizer)
 
 
 def main():
@@ -61,7 +50,7 @@ def main():
     st.subheader("Randomly Generated Data Points")
 
     # Initial figure and axis
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(16, 5))
 
     # Scatter plot of the data points
     ax1.scatter(X, y, color="blue", label="Data points")
@@ -79,6 +68,21 @@ def main():
     ax2.set_ylabel("Cost")
     (cost_plot,) = ax2.plot([], [], color="green")
 
+    # Loss surface over (m, b), computed once per dataset
+    m_axis, b_axis, surface = loss_surface(X, y)
+    ax3.contour(
+        m_axis,
+        b_axis,
+        surface,
+        levels=np.geomspace(surface.min(), surface.max(), 25),
+        cmap="viridis",
+        linewidths=0.8,
+    )
+    ax3.set_title("Loss Surface J(m, b)")
+    ax3.set_xlabel("m (slope)")
+    ax3.set_ylabel("b (intercept)")
+    (path_plot,) = ax3.plot([], [], color="red", marker=".", markersize=3)
+
     # Initialize the plot in Streamlit (create a single placeholder for the plot)
     plot_placeholder = st.pyplot(fig)
 
@@ -89,10 +93,13 @@ def main():
     iterations = st.slider(
         "Select Number of Iterations", min_value=1, max_value=100, value=50, step=1
     )
+    optimizer = st.selectbox("Optimizer", OPTIMIZERS)
 
     if st.button("Run Gradient Descent"):
         # Run gradient descent
-        history, cost_history = gradient_descent(X, y, learning_rate, iterations)
+        history, cost_history = gradient_descent(
+            X, y, learning_rate, iterations, optimizer
+        )
 
         # Loop through the gradient descent history to update the line and loss function
         for i in range(len(history)):
@@ -103,6 +110,11 @@ def main():
             # Update the loss plot
             cost_plot.set_data(range(i), cost_history[:i])
 
+            # Update the optimizer path on the loss surface, starting at (0, 0)
+            path_plot.set_data(
+                np.r_[0.0, history[: i + 1, 0]], np.r_[0.0, history[: i + 1, 1]]
+            )
+
             # Set axis limits dynamically
             ax2.set_xlim(0, len(cost_history))
             ax2.set_ylim(0, max(cost_history))
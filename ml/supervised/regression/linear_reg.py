@@ -7,6 +7,10 @@ from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 
+from eda.correlation import METHODS, correlation_with
+from ml.supervised.regression.animation import gradient_descent_animation
+from ml.supervised.regression.descent import descend, sufficient_statistics
+
 
 # ==========================================
 # HELPER: Gradient Descent Function (For Tab 1)
@@ -14,32 +18,12 @@ from sklearn.model_selection import train_test_split
 def run_gradient_descent(X, y, learning_rate=0.01, iterations=100):
     """
     Performs Gradient Descent to optimize the linear regression parameters m (slope) and b (intercept).
-    """
-    m = 0  # Initial slope
-    b = 0  # Initial intercept
-    n = len(X)
-    history = []
-    cost_history = []
-
-    for _ in range(iterations):
-        y_pred = m * X + b
-
-        # Calculate gradients (Partial derivatives)
-        dm = (-2 / n) * np.sum(X * (y - y_pred))
-        db = (-2 / n) * np.sum(y - y_pred)
-
-        # Update parameters
-        m -= learning_rate * dm
-        b -= learning_rate * db
-
-        # Calculate Cost (Mean Squared Error)
-        cost = np.mean((y - y_pred) ** 2)
 
-        # Store state for visualization
-        history.append((m, b))
-        cost_history.append(cost)
-
-    return history, cost_history
+    Returns an ``(iterations, 2)`` array of (m, b) after each update and the
+    cost before each update, computed from the data's sufficient statistics.
+    """
+    stats = sufficient_statistics(X, y)
+    return descend(stats, learning_rate, iterations)
 
 
 # ==========================================
@@ -74,7 +58,10 @@ def main():
             lr = st.slider("Learning Rate", 0.001, 0.1, 0.01, format="%.3f")
             iters = st.slider("Iterations (Steps)", 10, 100, 50)
 
-            run_btn = st.button("Run Simulation")
+            st.info(
+                "Press ▶ Play or drag the step slider. The animation runs in "
+                "your browser, so scrubbing does not recompute anything."
+            )
 
         with col_plot:
             # Generate Synthetic Data for Visualization
@@ -82,54 +69,12 @@ def main():
             X_vis = 2 * np.random.rand(n_points)
             y_vis = 4 + 3 * X_vis + np.random.randn(n_points) * noise
 
-            # Placeholders for dynamic plotting
-            plot_placeholder = st.empty()
-
-            if run_btn:
-                history, cost_history = run_gradient_descent(X_vis, y_vis, lr, iters)
-
-                # Animation Loop
-                for i in range(len(history)):
-                    m_curr, b_curr = history[i]
-
-                    # Create plot figure
-                    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
-
-                    # Subplot 1: Regression Line fitting the data
-                    ax1.scatter(
-                        X_vis, y_vis, color="blue", alpha=0.6, label="Data Points"
-                    )
-                    ax1.plot(
-                        X_vis,
-                        m_curr * X_vis + b_curr,
-                        color="red",
-                        linewidth=2,
-                        label="Regression Line",
-                    )
-                    ax1.set_title(f"Step {i + 1}: y = {m_curr:.2f}x + {b_curr:.2f}")
-                    ax1.set_ylim(0, max(y_vis) + 2)
-                    ax1.legend()
-
-                    # Subplot 2: Cost Function (Loss) decreasing
-                    ax2.plot(
-                        range(i + 1), cost_history[: i + 1], color="orange", linewidth=2
-                    )
-                    ax2.set_title(f"Cost (MSE): {cost_history[i]:.4f}")
-                    ax2.set_xlabel("Iteration")
-                    ax2.set_ylabel("Loss")
-
-                    # Render plot
-                    plot_placeholder.pyplot(fig)
-                    plt.close(fig)  # Clear memory
-
-                st.success("Gradient Descent Optimization Completed!")
-            else:
-                # Show initial state before running
-                fig, ax = plt.subplots(figsize=(6, 4))
-                ax.scatter(X_vis, y_vis, label="Data Points")
-                ax.set_title("Original Data")
-                ax.legend()
-                plot_placeholder.pyplot(fig)
+            # The whole trajectory is sent once as an animated figure
+            history, cost_history = run_gradient_descent(X_vis, y_vis, lr, iters)
+            st.plotly_chart(
+                gradient_descent_animation(X_vis, y_vis, history, cost_history),
+                use_container_width=True,
+            )
 
     # -------------------------------------------------------------------------
     # TAB 2: Practical Analysis (Real File Upload)
@@ -162,6 +107,20 @@ def main():
             if target in numeric_cols:
                 numeric_cols.remove(target)
 
+            if numeric_cols and pd.api.types.is_numeric_dtype(df[target]):
+                with st.expander("Rank features by correlation with the target"):
+                    method = st.selectbox(
+                        "Correlation method",
+                        METHODS,
+                        format_func=str.title,
+                        key="lr_corr_method",
+                    )
+                    ranking = correlation_with(df[numeric_cols], df[target], method)
+                    ranking = ranking.reindex(
+                        ranking.abs().sort_values(ascending=False).index
+                    )
+                    st.dataframe(ranking.rename("Correlation").to_frame())
+
             features = st.multiselect("Select Feature Variables (X)", numeric_cols)
 
             if features and st.button("Train Linear Model"):
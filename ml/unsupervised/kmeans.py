@@ -2,42 +2,281 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import streamlit as st
+from joblib import Parallel, delayed
+from scipy import stats
 from sklearn.cluster import KMeans
-from sklearn.datasets import make_blobs
 from sklearn.metrics import silhouette_score
 
+from caching import content_hash, make_blobs, memoize
+from ml.unsupervised.silhouette import MODES, silhouette
+from parallel import partition_threads
+
+# Rows scored per distance block, bounds the n x k temporary
+ASSIGN_CHUNK = 65_536
+# Uploads above this many rows are clustered with mini-batch updates
+MINIBATCH_THRESHOLD = 100_000
+MINIBATCH_SIZE = 4_096
+MINIBATCH_ITERATIONS = 100
+# Elbow search settings
+ELBOW_K = tuple(range(1, 11))
+SILHOUETTE_SAMPLE = 2_000
+SUBSAMPLE_SIZE = 10_000
+SUBSAMPLE_REPEATS = 5
+
 
 # ==========================================
-# HELPER: K-Means Algorithm (For Tab 1)
+# HELPER: K-Means Engine (Both Tabs)
 # ==========================================
-def k_means_algorithm(X, k, iterations=10):
+def squared_distances(X, centroids, x_sq=None):
     """
-    Manual implementation of K-Means step-by-step for visualization.
+    Squared Euclidean distances via ||x||^2 - 2 x.c + ||c||^2.
+
+    The cross term is a single matrix product, so no ``(n, k, d)``
+    temporary is built.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        centroids (np.ndarray): ``(k, d)`` centroids.
+        x_sq (np.ndarray | None): Precomputed squared norms of ``X``.
+
+    Returns:
+        np.ndarray: ``(n, k)`` squared distances.
     """
-    # Initialize centroids randomly from existing points
-    centroids = X[np.random.choice(X.shape[0], k, replace=False)]
-    history = []
+    if x_sq is None:
+        x_sq = np.einsum("ij,ij->i", X, X)
+    c_sq = np.einsum("ij,ij->i", centroids, centroids)
+    distances = x_sq[:, np.newaxis] - 2 * X @ centroids.T + c_sq
+    # Cancellation can leave tiny negative values
+    return np.maximum(distances, 0, out=distances)
 
-    for _ in range(iterations):
-        # Calculate distances from points to centroids
-        distances = np.linalg.norm(X[:, np.newaxis] - centroids, axis=2)
-        # Assign labels based on closest centroid
-        labels = np.argmin(distances, axis=1)
 
-        # Store state
-        history.append((centroids.copy(), labels.copy()))
+def assign_labels(X, centroids, chunk_size=ASSIGN_CHUNK):
+    """
+    Nearest-centroid labels and total inertia, scored in row blocks.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        centroids (np.ndarray): ``(k, d)`` centroids.
+        chunk_size (int): Rows per distance block.
+
+    Returns:
+        tuple: ``(n,)`` labels and the within-cluster sum of squares.
+    """
+    labels = np.empty(X.shape[0], dtype=np.intp)
+    inertia = 0.0
+    for start in range(0, X.shape[0], chunk_size):
+        block = squared_distances(X[start : start + chunk_size], centroids)
+        labels[start : start + chunk_size] = block.argmin(axis=1)
+        inertia += block.min(axis=1).sum()
+    return labels, inertia
+
 
-        # Update centroids to the mean of their assigned points
-        new_centroids = np.array([X[labels == i].mean(axis=0) for i in range(k)])
+def cluster_sums(X, labels, k):
+    """
+    Per-cluster coordinate sums and point counts.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        labels (np.ndarray): Cluster index of every point.
+        k (int): Number of clusters.
+
+    Returns:
+        tuple: ``(k, d)`` sums and ``(k,)`` counts.
+    """
+    counts = np.bincount(labels, minlength=k)
+    sums = np.column_stack(
+        [np.bincount(labels, weights=column, minlength=k) for column in X.T]
+    )
+    return sums, counts
+
+
+def kmeans_plus_plus(X, k, rng=None):
+    """
+    k-means++ seeding: each new centroid is drawn with probability
+    proportional to its squared distance from the closest chosen one.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        k (int): Number of centroids.
+        rng (np.random.Generator | None): Random generator.
+
+    Returns:
+        np.ndarray: ``(k, d)`` initial centroids.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    x_sq = np.einsum("ij,ij->i", X, X)
+    centroids = np.empty((k, X.shape[1]))
+    centroids[0] = X[rng.integers(X.shape[0])]
+    closest = squared_distances(X, centroids[:1], x_sq)[:, 0]
+    for i in range(1, k):
+        total = closest.sum()
+        if total > 0:
+            idx = rng.choice(X.shape[0], p=closest / total)
+        else:
+            # Fewer distinct points than clusters
+            idx = rng.integers(X.shape[0])
+        centroids[i] = X[idx]
+        new = squared_distances(X, centroids[i : i + 1], x_sq)[:, 0]
+        np.minimum(closest, new, out=closest)
+    return centroids
+
+
+def k_means_algorithm(
+    X,
+    k,
+    iterations=10,
+    init="k-means++",
+    batch_size=None,
+    keep_labels=True,
+    rng=None,
+):
+    """
+    K-Means step-by-step, recording every iteration for visualization.
+
+    With ``batch_size`` set, each iteration draws a random mini-batch and
+    moves the centroids towards it with per-centroid learning rates that
+    decay as the centroid absorbs more points (Sculley, 2010).
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        k (int): Number of clusters.
+        iterations (int): Maximum number of iterations.
+        init (str): ``"k-means++"`` or ``"random"`` seeding.
+        batch_size (int | None): Mini-batch size, ``None`` for full batch.
+        keep_labels (bool): Label every point at every iteration. When
+            False the earlier entries hold ``None`` and the last entry is
+            replaced by the final centroids with their labels, which keeps
+            mini-batch runs on large uploads at one full pass.
+        rng (np.random.Generator | None): Random generator.
+
+    Returns:
+        list: ``(centroids, labels)`` pairs, one per iteration.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    X = np.asarray(X, dtype=float)
+    if init == "k-means++":
+        centroids = kmeans_plus_plus(X, k, rng)
+    else:
+        centroids = X[rng.choice(X.shape[0], k, replace=False)]
+    counts = np.zeros(k)
+    history = []
 
-        # Check for convergence
-        if np.all(centroids == new_centroids):
+    for _ in range(iterations):
+        if batch_size is None or keep_labels:
+            labels = assign_labels(X, centroids)[0]
+        history.append((centroids.copy(), labels if keep_labels else None))
+
+        if batch_size is None:
+            sums, sizes = cluster_sums(X, labels, k)
+            # Empty clusters keep their previous centroid
+            new_centroids = np.where(
+                sizes[:, np.newaxis] > 0,
+                sums / np.maximum(sizes, 1)[:, np.newaxis],
+                centroids,
+            )
+        else:
+            batch = X[rng.integers(X.shape[0], size=batch_size)]
+            batch_labels = assign_labels(batch, centroids)[0]
+            sums, sizes = cluster_sums(batch, batch_labels, k)
+            counts += sizes
+            rate = np.divide(sizes, counts, out=np.zeros(k), where=counts > 0)
+            batch_means = sums / np.maximum(sizes, 1)[:, np.newaxis]
+            new_centroids = centroids + rate[:, np.newaxis] * (batch_means - centroids)
+
+        if np.array_equal(centroids, new_centroids):
             break
         centroids = new_centroids
 
+    if not keep_labels:
+        history[-1] = (centroids.copy(), assign_labels(X, centroids)[0])
     return history
 
 
+# ==========================================
+# HELPER: Elbow Service (For Tab 2)
+# ==========================================
+def elbow_point(X, k, seed=42):
+    """
+    Inertia and sampled silhouette of one K-Means fit.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        k (int): Number of clusters.
+        seed (int): Seed of the fit and of the silhouette sample.
+
+    Returns:
+        tuple: Inertia and silhouette score (NaN when undefined).
+    """
+    model = KMeans(n_clusters=k, random_state=seed).fit(X)
+    silhouette = np.nan
+    if k > 1:
+        try:
+            silhouette = silhouette_score(
+                X,
+                model.labels_,
+                sample_size=min(len(X), SILHOUETTE_SAMPLE),
+                random_state=seed,
+            )
+        except ValueError:
+            # The sample landed in a single cluster
+            pass
+    return model.inertia_, silhouette
+
+
+@memoize(
+    key=lambda X, features, subsample=False: (content_hash(X), features, subsample)
+)
+def elbow_curve(X, features, subsample=False):
+    """
+    Inertia and silhouette for every K in ``ELBOW_K``, fitted in a process pool.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        features (tuple[str, ...]): Column names of ``X``, part of the key.
+        subsample (bool): Estimate the curve from ``SUBSAMPLE_REPEATS`` random
+            subsamples of ``SUBSAMPLE_SIZE`` rows, with inertia rescaled to
+            the full data and a 95% confidence interval.
+
+    Returns:
+        pd.DataFrame: ``k``, ``inertia``, ``inertia_low``, ``inertia_high``
+            and ``silhouette`` columns.
+    """
+    k_values = [k for k in ELBOW_K if k <= len(X)]
+    if subsample:
+        rng = np.random.default_rng(42)
+        samples = [
+            rng.choice(len(X), SUBSAMPLE_SIZE, replace=False)
+            for _ in range(SUBSAMPLE_REPEATS)
+        ]
+        scale = len(X) / SUBSAMPLE_SIZE
+    else:
+        samples = [slice(None)]
+        scale = 1.0
+
+    tasks = [(k, s) for k in k_values for s in range(len(samples))]
+    n_jobs, _ = partition_threads(len(tasks))
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(elbow_point)(X[samples[s]], k, seed=42 + s) for k, s in tasks
+    )
+    inertia = np.array([r[0] for r in results]).reshape(len(k_values), -1) * scale
+    silhouette = np.array([r[1] for r in results]).reshape(len(k_values), -1)
+
+    mean = inertia.mean(axis=1)
+    half_width = np.zeros_like(mean)
+    if len(samples) > 1:
+        t_crit = stats.t.ppf(0.975, len(samples) - 1)
+        half_width = t_crit * inertia.std(axis=1, ddof=1) / np.sqrt(len(samples))
+    return pd.DataFrame(
+        {
+            "k": k_values,
+            "inertia": mean,
+            "inertia_low": mean - half_width,
+            "inertia_high": mean + half_width,
+            "silhouette": silhouette.mean(axis=1),
+        }
+    )
+
+
 # ==========================================
 # MAIN APP MODULE
 # ==========================================
@@ -62,6 +301,12 @@ def main():
             st.subheader("Simulation Config")
             n_centers = st.slider("Number of True Clusters", 2, 5, 3)
             k_clusters = st.slider("K (Centroids to find)", 2, 5, 3)
+            init = st.radio("Initialization", ["k-means++", "random"], horizontal=True)
+            mini_batch = st.checkbox(
+                "Mini-batch updates",
+                help="Each iteration moves the centroids using a random batch "
+                "of 32 points instead of the whole dataset.",
+            )
             st.info("Click 'Run Animation' to see the centroids move.")
 
         with col_anim:
@@ -73,7 +318,13 @@ def main():
             placeholder = st.empty()
 
             if st.button("Run Animation"):
-                history = k_means_algorithm(X, k_clusters)
+                history = k_means_algorithm(
+                    X,
+                    k_clusters,
+                    iterations=30 if mini_batch else 10,
+                    init=init,
+                    batch_size=32 if mini_batch else None,
+                )
 
                 # Animation Loop
                 for i, (centroids, labels) in enumerate(history):
@@ -140,19 +391,54 @@ def main():
                     "The 'Elbow' of the graph represents the optimal number of clusters."
                 )
 
-                wcss = []
-                range_k = range(1, 11)
-                for k in range_k:
-                    kmeans = KMeans(n_clusters=k, random_state=42)
-                    kmeans.fit(X_real)
-                    wcss.append(kmeans.inertia_)
+                subsample = st.checkbox(
+                    f"Estimate on {SUBSAMPLE_REPEATS} subsamples of "
+                    f"{SUBSAMPLE_SIZE:,} rows",
+                    value=len(X_real) > 5 * SUBSAMPLE_SIZE,
+                    disabled=len(X_real) <= SUBSAMPLE_SIZE,
+                    help="Faster on large uploads. Bars show 95% confidence "
+                    "intervals of the rescaled WCSS.",
+                )
+                elbow = elbow_curve(
+                    X_real,
+                    tuple(selected_features),
+                    subsample and len(X_real) > SUBSAMPLE_SIZE,
+                )
 
                 fig_elbow, ax_elbow = plt.subplots(figsize=(8, 3))
-                ax_elbow.plot(range_k, wcss, marker="o", linestyle="--")
+                ax_elbow.errorbar(
+                    elbow["k"],
+                    elbow["inertia"],
+                    yerr=[
+                        elbow["inertia"] - elbow["inertia_low"],
+                        elbow["inertia_high"] - elbow["inertia"],
+                    ],
+                    marker="o",
+                    linestyle="--",
+                    capsize=3,
+                    label="WCSS",
+                )
                 ax_elbow.set_xlabel("Number of Clusters (K)")
                 ax_elbow.set_ylabel("WCSS (Within-Cluster Sum of Square)")
                 ax_elbow.set_title("Elbow Method Graph")
+                ax_sil = ax_elbow.twinx()
+                ax_sil.plot(
+                    elbow["k"],
+                    elbow["silhouette"],
+                    marker="s",
+                    color="#F39C12",
+                    label="Silhouette (sampled)",
+                )
+                ax_sil.set_ylabel("Silhouette")
+                lines = ax_elbow.get_legend_handles_labels()
+                sil_lines = ax_sil.get_legend_handles_labels()
+                ax_elbow.legend(lines[0] + sil_lines[0], lines[1] + sil_lines[1])
                 st.pyplot(fig_elbow)
+                st.caption(
+                    f"Silhouette is estimated on at most {SILHOUETTE_SAMPLE:,} "
+                    "points per fit. Results are cached, so changing K below "
+                    "does not refit the curve."
+                )
 
                 # Final Clustering
                 st.subheader("3. Apply Clustering")
@@ -162,19 +448,52 @@ def main():
                     max_value=10,
                     value=3,
                 )
+                sil_mode = st.radio(
+                    "Silhouette mode",
+                    MODES,
+                    horizontal=True,
+                    help="Auto scores exactly while the distance matrix fits in "
+                    "memory, then switches to a stratified sample and finally "
+                    "to the centroid-based simplified silhouette.",
+                )
 
                 if st.button("Run K-Means Clustering"):
                     # Train model
-                    km_final = KMeans(n_clusters=final_k, random_state=42)
-                    y_kmeans = km_final.fit_predict(X_real)
+                    if len(X_real) > MINIBATCH_THRESHOLD:
+                        # Mini-batch updates keep million-row uploads responsive
+                        centers, y_kmeans = k_means_algorithm(
+                            X_real,
+                            final_k,
+                            iterations=MINIBATCH_ITERATIONS,
+                            batch_size=MINIBATCH_SIZE,
+                            keep_labels=False,
+                            rng=np.random.default_rng(42),
+                        )[-1]
+                    else:
+                        km_final = KMeans(n_clusters=final_k, random_state=42)
+                        y_kmeans = km_final.fit_predict(X_real)
+                        centers = km_final.cluster_centers_
 
                     # Metrics
-                    sil_score = silhouette_score(X_real, y_kmeans)
-                    st.metric(
-                        "Silhouette Score",
-                        f"{sil_score:.4f}",
-                        help="Close to 1 is good, close to -1 is bad.",
-                    )
+                    present = np.unique(y_kmeans)
+                    if len(present) > 1:
+                        sil = silhouette(
+                            X_real,
+                            y_kmeans,
+                            mode=sil_mode,
+                            centroids=centers[present],
+                            rng=np.random.default_rng(42),
+                        )
+                        sil_text = f"{sil['score']:.4f}"
+                        if sil["mode"] == "sampled":
+                            sil_text += f" ± {1.96 * sil['error']:.4f}"
+                        st.metric(
+                            f"Silhouette Score ({sil['mode']})",
+                            sil_text,
+                            help="Close to 1 is good, close to -1 is bad.",
+                        )
+                    else:
+                        st.warning("All points fell into one cluster.")
 
                     # Visualization
                     fig_res, ax_res = plt.subplots()
@@ -188,7 +507,6 @@ def main():
                         alpha=0.6,
                     )
                     # Plot centers
-                    centers = km_final.cluster_centers_
                     ax_res.scatter(
                         centers[:, 0],
                         centers[:, 1],
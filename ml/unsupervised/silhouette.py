@@ -0,0 +1,215 @@
+"""
+Silhouette Scoring - Bounded-memory silhouette for large clusterings
+Exact scores are computed in row blocks, large datasets fall back to a
+stratified-sample estimate and the centroid-based simplified silhouette
+scales to any number of rows
+"""
+
+import numpy as np
+from sklearn.metrics.pairwise import euclidean_distances
+
+MEMORY_BUDGET = 256 * 1024**2
+N_BOOTSTRAP = 200
+# Below this sampling fraction the estimate is replaced by the simplified score
+MIN_SAMPLE_FRACTION = 1e-3
+MODES = ["auto", "exact", "sampled", "simplified"]
+
+
+def _encode(labels):
+    """Cluster index of every point and the size of every cluster."""
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    return inverse, counts
+
+
+def silhouette_values(X, labels, memory_budget=MEMORY_BUDGET):
+    """
+    Exact silhouette of every point, computed in blocks of rows.
+
+    Each block holds the distances from a few rows to all points, and a
+    product with the one-hot cluster matrix turns them into per-cluster
+    distance sums, so memory stays within ``memory_budget``.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        labels (np.ndarray): Cluster label of every point.
+        memory_budget (int): Bytes allowed for one distance block.
+
+    Returns:
+        np.ndarray: ``(n,)`` silhouette values, 0 for singleton clusters.
+    """
+    inverse, counts = _encode(labels)
+    n, k = len(X), len(counts)
+    one_hot = np.zeros((n, k))
+    one_hot[np.arange(n), inverse] = 1.0
+    x_sq = np.einsum("ij,ij->i", X, X)[np.newaxis, :]
+    block = max(1, memory_budget // (8 * n))
+
+    values = np.empty(n)
+    for start in range(0, n, block):
+        rows = slice(start, start + block)
+        own = inverse[rows]
+        sums = euclidean_distances(X[rows], X, Y_norm_squared=x_sq) @ one_hot
+        idx = np.arange(len(own))
+        a = sums[idx, own] / np.maximum(counts[own] - 1, 1)
+        means = sums / counts
+        means[idx, own] = np.inf
+        b = means.min(axis=1)
+        with np.errstate(invalid="ignore"):
+            s = (b - a) / np.maximum(a, b)
+        values[rows] = np.where(counts[own] > 1, np.nan_to_num(s), 0.0)
+    return values
+
+
+def silhouette_sampled(
+    X,
+    labels,
+    sample_size,
+    n_bootstrap=N_BOOTSTRAP,
+    memory_budget=MEMORY_BUDGET,
+    rng=None,
+):
+    """
+    Silhouette estimated on a stratified sample with a bootstrap error bar.
+
+    Every cluster is sampled in proportion to its size, with at least two
+    points where possible. Points are weighted by the inverse of their
+    cluster's sampling rate so small clusters are not over-represented.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        labels (np.ndarray): Cluster label of every point.
+        sample_size (int): Approximate number of sampled points.
+        n_bootstrap (int): Bootstrap resamples for the standard error.
+        memory_budget (int): Bytes allowed for one distance block.
+        rng (np.random.Generator | None): Random generator.
+
+    Returns:
+        tuple: Estimated score and its bootstrap standard error.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    inverse, counts = _encode(labels)
+    quota = np.minimum(
+        counts, np.maximum(2, np.round(sample_size * counts / len(X)).astype(int))
+    )
+    sample = np.concatenate(
+        [
+            rng.choice(np.flatnonzero(inverse == c), quota[c], replace=False)
+            for c in range(len(counts))
+        ]
+    )
+    values = silhouette_values(X[sample], inverse[sample], memory_budget)
+    weights = (counts / quota)[inverse[sample]]
+
+    score = np.average(values, weights=weights)
+    resamples = rng.integers(len(sample), size=(n_bootstrap, len(sample)))
+    boot = (values[resamples] * weights[resamples]).sum(axis=1) / weights[
+        resamples
+    ].sum(axis=1)
+    return score, boot.std(ddof=1)
+
+
+def silhouette_simplified(X, labels, centroids=None, memory_budget=MEMORY_BUDGET):
+    """
+    Centroid-based simplified silhouette in O(n k).
+
+    The mean distance to a cluster is replaced by the distance to its
+    centroid, which is a close proxy for compact, convex clusters such as
+    those K-Means finds.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        labels (np.ndarray): Cluster label of every point.
+        centroids (np.ndarray | None): ``(k, d)`` centroids in the order of
+            the sorted labels. Computed from ``X`` when omitted.
+        memory_budget (int): Bytes allowed for one distance block.
+
+    Returns:
+        float: Simplified silhouette score.
+    """
+    inverse, counts = _encode(labels)
+    k = len(counts)
+    if centroids is None:
+        centroids = (
+            np.column_stack(
+                [np.bincount(inverse, weights=column, minlength=k) for column in X.T]
+            )
+            / counts[:, np.newaxis]
+        )
+    block = max(1, memory_budget // (8 * k))
+
+    total = 0.0
+    for start in range(0, len(X), block):
+        rows = slice(start, start + block)
+        own = inverse[rows]
+        dist = euclidean_distances(X[rows], centroids)
+        idx = np.arange(len(own))
+        a = dist[idx, own]
+        dist[idx, own] = np.inf
+        b = dist.min(axis=1)
+        with np.errstate(invalid="ignore"):
+            s = np.nan_to_num((b - a) / np.maximum(a, b))
+        total += np.where(counts[own] > 1, s, 0.0).sum()
+    return total / len(X)
+
+
+def choose_mode(n_samples, memory_budget=MEMORY_BUDGET):
+    """
+    Pick the cheapest silhouette mode that is accurate for ``n_samples``.
+
+    The exact score is used while the full distance matrix would fit in the
+    memory budget. Beyond that a sample as large as the budget allows is
+    scored, until it would cover less than ``MIN_SAMPLE_FRACTION`` of the
+    data and the simplified score takes over.
+
+    Args:
+        n_samples (int): Number of clustered points.
+        memory_budget (int): Bytes allowed for one distance matrix.
+
+    Returns:
+        str: ``"exact"``, ``"sampled"`` or ``"simplified"``.
+    """
+    sample_size = int(np.sqrt(memory_budget / 8))
+    if n_samples <= sample_size:
+        return "exact"
+    if sample_size / n_samples >= MIN_SAMPLE_FRACTION:
+        return "sampled"
+    return "simplified"
+
+
+def silhouette(
+    X, labels, mode="auto", centroids=None, memory_budget=MEMORY_BUDGET, rng=None
+):
+    """
+    Silhouette score with bounded memory.
+
+    Args:
+        X (np.ndarray): ``(n, d)`` points.
+        labels (np.ndarray): Cluster label of every point.
+        mode (str): One of ``MODES``. ``"auto"`` defers to ``choose_mode``.
+        centroids (np.ndarray | None): Centroids for the simplified mode.
+        memory_budget (int): Bytes allowed for distance blocks.
+        rng (np.random.Generator | None): Random generator for sampling.
+
+    Returns:
+        dict: ``score``, its standard ``error`` (0 unless sampled) and the
+            ``mode`` that was used.
+    """
+    X = np.asarray(X, dtype=float)
+    if len(np.unique(labels)) < 2:
+        raise ValueError("Silhouette needs at least two clusters.")
+    if mode == "auto":
+        mode = choose_mode(len(X), memory_budget)
+
+    error = 0.0
+    if mode == "exact":
+        score = silhouette_values(X, labels, memory_budget).mean()
+    elif mode == "sampled":
+        sample_size = min(len(X), int(np.sqrt(memory_budget / 8)))
+        score, error = silhouette_sampled(
+            X, labels, sample_size, memory_budget=memory_budget, rng=rng
+        )
+    elif mode == "simplified":
+        score = silhouette_simplified(X, labels, centroids, memory_budget)
+    else:
+        raise ValueError(f"Unknown silhouette mode: {mode}")
+    return {"score": float(score), "error": float(error), "mode": mode}
@@ -1,9 +1,18 @@
 import matplotlib.pyplot as plt
-import pandas as pd
 import seaborn as sns
 import streamlit as st
 
 import utils
+from caching import content_hash
+from eda.correlation import (
+    ANNOTATED_MAX_COLUMNS,
+    METHODS,
+    correlation_heatmap,
+    frame_correlation,
+    top_pairs,
+)
+from eda.ingest import PYARROW_AVAILABLE, data_root, load_csv, resolve_data_path
+from eda.profile import profile_file, profile_frame
 
 # Page Configuration
 st.set_page_config(
@@ -52,14 +61,64 @@ uploaded_file = st.file_uploader(
     type=["csv"],
     help="Select a CSV file from your computer",
 )
-
-if uploaded_file is not None:
+use_pyarrow = st.checkbox(
+    "Parse with the multithreaded pyarrow engine",
+    value=PYARROW_AVAILABLE,
+    disabled=not PYARROW_AVAILABLE,
+    help="Faster on large files. Without it the file is read in chunks.",
+)
+approximate = st.checkbox(
+    "Approximate distinct counts and quartiles",
+    help=(
+        "Uses HyperLogLog and KLL sketches instead of exact counts and sorting. "
+        "Much faster on large, high-cardinality columns; error bounds are shown "
+        "in the tables."
+    ),
+)
+# Out-of-core mode only reads from a directory the operator has configured
+data_dir = data_root()
+server_path = ""
+if data_dir is not None:
+    with st.expander("🗄️ Files larger than memory", expanded=False):
+        server_path = st.text_input(
+            "Path to a CSV or Parquet file in the server's data directory",
+            help=(
+                "Out-of-core mode: CSV files are converted once to a Parquet cache "
+                "and streamed in batches, so the file never has to fit in memory. "
+                "Quartiles and distinct counts are estimated with sketches, "
+                "duplicate rows are counted exactly on disk."
+            ),
+        ).strip()
+
+if uploaded_file is not None or server_path:
     try:
-        # Load Data
-        df = pd.read_csv(uploaded_file)
+        if server_path:
+            # Stream the file from disk, the profile is all that is kept
+            path = resolve_data_path(server_path, data_dir)
+            with st.spinner("Streaming the file from disk..."):
+                profile = profile_file(path)
+            storage = "streamed from disk"
+            file_name = path.name
+        else:
+            # Load Data (parsed once per file content and kept in memory)
+            data = uploaded_file.getvalue()
+            file_hash = content_hash(data)
+            engine = "pyarrow" if use_pyarrow else "c"
+            df, memory_bytes = load_csv(data, file_hash, engine)
+            memory_mb = memory_bytes / 1024**2
+            profile = profile_frame(df, file_hash, engine, approximate)
+            storage = f"{memory_mb:,.1f} MB in memory"
+            file_name = uploaded_file.name
+
+        # Every section below renders from this one profile of the file
+        n_rows, n_cols = profile.rows, len(profile.columns)
+        numeric_columns = profile.numeric_columns
+        missing_data = profile.missing
+        total_cells = n_rows * n_cols
+        total_missing = missing_data.sum()
 
         success_msg = (
-            f"Dataset: {uploaded_file.name} ({df.shape[0]} rows, {df.shape[1]} columns)"
+            f"Dataset: {file_name} ({n_rows} rows, {n_cols} columns, {storage})"
         )
         utils.render_success_box(title="File Loaded Successfully", content=success_msg)
 
@@ -70,30 +129,21 @@ if uploaded_file is not None:
 
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("📈 Total Rows", f"{df.shape[0]:,}")
+            st.metric("📈 Total Rows", f"{n_rows:,}")
         with col2:
-            st.metric("📋 Total Columns", f"{df.shape[1]}")
+            st.metric("📋 Total Columns", f"{n_cols}")
         with col3:
-            missing_count = df.isna().sum().sum()
-            st.metric("❌ Missing Values", f"{missing_count:,}")
+            st.metric("❌ Missing Values", f"{total_missing:,}")
         with col4:
-            numeric_count = df.select_dtypes(include=["float64", "int64"]).shape[1]
-            st.metric("🔢 Numeric Columns", f"{numeric_count}")
+            st.metric("🔢 Numeric Columns", f"{len(numeric_columns)}")
 
         with st.expander("📋 View First 10 Rows", expanded=False):
-            st.dataframe(df.head(10), use_container_width=True)
+            st.dataframe(profile.preview, use_container_width=True)
 
         with st.expander("📚 Column Information", expanded=False):
-            col_info = pd.DataFrame(
-                {
-                    "Column": df.columns,
-                    "Type": df.dtypes.astype(str),
-                    "Non-Null": df.notna().sum().values,
-                    "Null": df.isna().sum().values,
-                    "Unique": df.nunique().values,
-                }
+            st.dataframe(
+                profile.column_info(), use_container_width=True, hide_index=True
             )
-            st.dataframe(col_info, use_container_width=True)
 
         utils.render_section_divider()
 
@@ -104,13 +154,8 @@ if uploaded_file is not None:
 
         st.write("Summary statistics for numerical columns:")
 
-        numeric_df = df.select_dtypes(include=["float64", "int64"])
-        if not numeric_df.empty:
-            stats_df = numeric_df.describe().T
-            stats_df = stats_df[
-                ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
-            ]
-            st.dataframe(stats_df, use_container_width=True)
+        if numeric_columns:
+            st.dataframe(profile.describe(), use_container_width=True)
         else:
             utils.render_warning_box(
                 title="No Numeric Data",
@@ -125,12 +170,24 @@ if uploaded_file is not None:
         st.markdown("### 🔗 3. Correlation Matrix")
         st.write("Analyze the relationship between numerical variables.")
 
-        # Filter only numeric columns for correlation
-        numeric_df = df.select_dtypes(include=["float64", "int64"])
-
-        if not numeric_df.empty:
-            # Calculate correlation
-            corr = numeric_df.corr()
+        if numeric_columns:
+            method = st.selectbox(
+                "Correlation method",
+                METHODS,
+                format_func=str.title,
+                disabled=bool(server_path),
+                help=(
+                    "Pearson measures linear relationships, Spearman and Kendall "
+                    "monotonic ones from ranks. Files streamed from disk support "
+                    "Pearson only."
+                ),
+            )
+            if server_path or method == "pearson":
+                # Pairwise correlations gathered while profiling
+                corr = profile.correlation
+            else:
+                with st.spinner(f"Computing {method.title()} correlations..."):
+                    corr = frame_correlation(df, file_hash, method)
 
             # Create two columns for better layout
             col1, col2 = st.columns([1, 2])
@@ -139,25 +196,10 @@ if uploaded_file is not None:
                 st.markdown("#### Correlation Statistics")
                 st.write(f"Variables analyzed: {corr.shape[0]}")
 
-                # Find highest correlations (excluding 1.0)
-                corr_pairs = []
-                for i in range(len(corr.columns)):
-                    for j in range(i + 1, len(corr.columns)):
-                        corr_pairs.append(
-                            {
-                                "Var1": corr.columns[i],
-                                "Var2": corr.columns[j],
-                                "Correlation": corr.iloc[i, j],
-                            }
-                        )
-
-                if corr_pairs:
-                    corr_pairs_df = pd.DataFrame(corr_pairs)
-                    corr_pairs_df["Abs_Corr"] = corr_pairs_df["Correlation"].abs()
-                    top_corr = corr_pairs_df.nlargest(5, "Abs_Corr")[
-                        ["Var1", "Var2", "Correlation"]
-                    ]
+                # Find highest correlations (excluding the diagonal)
+                top_corr = top_pairs(corr, k=5)
 
+                if not top_corr.empty:
                     st.write("**Top 5 Correlations:**")
                     for idx, row in top_corr.iterrows():
                         st.write(
@@ -165,22 +207,26 @@ if uploaded_file is not None:
                         )
 
             with col2:
-                # Plot Heatmap
-                fig, ax = plt.subplots(figsize=(10, 8))
-                sns.heatmap(
-                    corr,
-                    annot=True,
-                    cmap="coolwarm",
-                    fmt=".2f",
-                    ax=ax,
-                    linewidths=0.5,
-                    cbar_kws={"label": "Correlation"},
-                )
-                ax.set_title(
-                    "Correlation Heatmap", fontsize=14, fontweight="bold", pad=20
-                )
-                plt.tight_layout()
-                st.pyplot(fig)
+                if corr.shape[0] > ANNOTATED_MAX_COLUMNS:
+                    # Too wide to annotate, cluster and tile it interactively
+                    st.plotly_chart(correlation_heatmap(corr), use_container_width=True)
+                else:
+                    # Plot Heatmap
+                    fig, ax = plt.subplots(figsize=(10, 8))
+                    sns.heatmap(
+                        corr,
+                        annot=True,
+                        cmap="coolwarm",
+                        fmt=".2f",
+                        ax=ax,
+                        linewidths=0.5,
+                        cbar_kws={"label": "Correlation"},
+                    )
+                    ax.set_title(
+                        "Correlation Heatmap", fontsize=14, fontweight="bold", pad=20
+                    )
+                    plt.tight_layout()
+                    st.pyplot(fig)
         else:
             utils.render_warning_box(
                 title="No Numeric Data",
@@ -194,16 +240,11 @@ if uploaded_file is not None:
         # ==========================================
         st.markdown("### 🔍 4. Missing Values Analysis")
 
-        missing_data = df.isna().sum()
-        missing_data = missing_data[missing_data > 0].sort_values(ascending=False)
-
         if not missing_data.empty:
             col1, col2 = st.columns([1, 2])
 
             with col1:
                 st.markdown("#### Missing Value Summary")
-                total_cells = df.shape[0] * df.shape[1]
-                total_missing = missing_data.sum()
                 missing_percentage = (total_missing / total_cells) * 100
 
                 st.metric("Total Missing Cells", f"{total_missing:,}")
@@ -211,7 +252,7 @@ if uploaded_file is not None:
 
                 st.markdown("#### Affected Columns")
                 for col, count in missing_data.items():
-                    pct = (count / df.shape[0]) * 100
+                    pct = (count / n_rows) * 100
                     st.write(f"• **{col}**: {count} ({pct:.1f}%)")
 
             with col2:
@@ -240,12 +281,13 @@ if uploaded_file is not None:
         # ==========================================
         st.markdown("### 📈 5. Distribution Analysis")
 
-        numeric_df = df.select_dtypes(include=["float64", "int64"])
+        # Histograms and box plots come from the profile, not the raw column
+        distributions = list(profile.histograms)
 
-        if not numeric_df.empty:
+        if distributions:
             selected_column = st.selectbox(
                 "Select a numeric column to visualize its distribution",
-                numeric_df.columns,
+                distributions,
                 key="dist_col",
             )
 
@@ -253,8 +295,14 @@ if uploaded_file is not None:
 
             with col1:
                 fig, ax = plt.subplots(figsize=(8, 5))
-                numeric_df[selected_column].hist(
-                    bins=30, ax=ax, color="#00AEEF", edgecolor="black", alpha=0.7
+                counts, edges = profile.histograms[selected_column]
+                ax.stairs(
+                    counts,
+                    edges,
+                    fill=True,
+                    color="#00AEEF",
+                    edgecolor="black",
+                    alpha=0.7,
                 )
                 ax.set_title(
                     f"Distribution of {selected_column}", fontsize=12, fontweight="bold"
@@ -266,7 +314,8 @@ if uploaded_file is not None:
 
             with col2:
                 fig, ax = plt.subplots(figsize=(8, 5))
-                numeric_df[selected_column].plot(kind="box", ax=ax, vert=True)
+                box = {**profile.boxes[selected_column], "label": selected_column}
+                ax.bxp([box])
                 ax.set_title(
                     f"Box Plot of {selected_column}", fontsize=12, fontweight="bold"
                 )
@@ -288,8 +337,8 @@ if uploaded_file is not None:
 
         quality_metrics = {
             "Completeness": f"{((total_cells - total_missing) / total_cells * 100):.2f}%",
-            "Duplicate Rows": df.duplicated().sum(),
-            "Unique Values Ratio": f"{df.nunique().sum() / df.shape[1]:.2f}",
+            "Duplicate Rows": f"{profile.duplicate_rows:,}",
+            "Unique Values Ratio": f"{profile.columns['Unique'].sum() / n_cols:.2f}",
         }
 
         col1, col2, col3 = st.columns(3)
@@ -0,0 +1,28 @@
+"""
+Thread Budgets - Splitting the machine's cores between concurrent tasks
+Native libraries and NumPy release the GIL, so a few concurrent tasks with
+their thread budgets split between them keep every core busy without
+oversubscribing the machine
+"""
+
+import os
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def partition_threads(
+    n_tasks: int, max_workers: int = DEFAULT_MAX_WORKERS
+) -> tuple[int, int]:
+    """
+    Split the available cores between concurrent tasks.
+
+    Args:
+        n_tasks (int): Number of tasks to run.
+        max_workers (int): Upper bound on concurrent tasks.
+
+    Returns:
+        tuple: Number of concurrent workers and threads per task.
+    """
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(n_tasks, max_workers, cpus))
+    return workers, max(1, cpus // workers)
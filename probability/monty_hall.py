@@ -1,43 +1,162 @@
-import random
+import time
+from fractions import Fraction
 
-import matplotlib.pyplot as plt
+import altair as alt
+import numpy as np
+import pandas as pd
 import streamlit as st
 
-
-def monty_hall_simulation(num_simulations):
-    switch_wins = []
-    stay_wins = []
-    switch_count = 0
-    stay_count = 0
-
-    for i in range(num_simulations):
-        # Set up the game
-        doors = ["goat", "goat", "car"]
-        random.shuffle(doors)
-
-        # Player's initial choice
-        player_choice = random.randint(0, 2)
-
-        # Monty opens a door
-        monty_opens = next(
-            i for i in range(3) if i != player_choice and doors[i] == "goat"
+SIMULATION_OPTIONS = [100, 1_000, 2_500, 10_000, 100_000, 1_000_000, 10_000_000]
+ANIMATION_FRAMES = 25
+FRAME_DELAY = 0.04
+MAX_PLOT_POINTS = 2_000
+
+
+def monty_hall_simulation(
+    num_simulations: int,
+    n_doors: int = 3,
+    doors_opened: int = 1,
+    seed: int | np.random.Generator | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate Monty Hall games in one vectorized batch.
+
+    The car position and the player's first pick are drawn as integer arrays.
+    The host then opens ``doors_opened`` goat doors, and the switching player
+    moves to one of the remaining closed doors uniformly at random. Which
+    goats the host reveals does not affect either outcome, so only the final
+    switch choice has to be drawn.
+
+    Args:
+        num_simulations (int): Number of games to play.
+        n_doors (int): Total number of doors.
+        doors_opened (int): Number of goat doors the host opens.
+        seed (int | np.random.Generator | None): Seed or generator for
+            reproducible runs.
+
+    Returns:
+        tuple: Cumulative win rates for switching and staying after each game.
+    """
+    if n_doors < 3:
+        raise ValueError("The game needs at least 3 doors")
+    if not 1 <= doors_opened <= n_doors - 2:
+        raise ValueError("The host must open between 1 and n_doors - 2 doors")
+
+    rng = np.random.default_rng(seed)
+    door_dtype = np.min_scalar_type(n_doors)
+    car = rng.integers(0, n_doors, size=num_simulations, dtype=door_dtype)
+    first_pick = rng.integers(0, n_doors, size=num_simulations, dtype=door_dtype)
+    stay_win = car == first_pick
+
+    # After a wrong first pick the car is always among the closed doors left
+    # to switch to, and the player lands on it with probability 1 / remaining.
+    remaining = n_doors - 1 - doors_opened
+    if remaining == 1:
+        switch_win = ~stay_win
+    else:
+        switch_win = ~stay_win & (
+            rng.integers(0, remaining, size=num_simulations, dtype=door_dtype) == 0
         )
 
-        # Switch strategy
-        switch_choice = next(
-            i for i in range(3) if i != player_choice and i != monty_opens
-        )
+    games = np.arange(1, num_simulations + 1)
+    switch_wins = np.cumsum(switch_win, dtype=np.int64) / games
+    stay_wins = np.cumsum(stay_win, dtype=np.int64) / games
+    return switch_wins, stay_wins
 
-        # Count wins
-        if doors[switch_choice] == "car":
-            switch_count += 1
-        if doors[player_choice] == "car":
-            stay_count += 1
 
-        switch_wins.append(switch_count / (i + 1))
-        stay_wins.append(stay_count / (i + 1))
+def convergence_frames(
+    num_simulations: int,
+    frames: int = ANIMATION_FRAMES,
+    max_points: int = MAX_PLOT_POINTS,
+) -> list[np.ndarray]:
+    """
+    Pick the games to plot and split them into animation frames.
+
+    Half of the point budget is log-spaced so the noisy early games stay
+    visible, the other half is linear so the tail is evenly covered.
+
+    Args:
+        num_simulations (int): Number of simulated games.
+        frames (int): Number of animation frames.
+        max_points (int): Upper bound on the number of plotted games.
+
+    Returns:
+        list: Ascending arrays of 1-based game numbers, one per frame.
+    """
+    half = max(1, max_points // 2)
+    games = np.unique(
+        np.concatenate(
+            [
+                np.geomspace(1, num_simulations, half),
+                np.linspace(1, num_simulations, half),
+            ]
+        ).astype(np.int64)
+    )
+    return np.array_split(games, min(frames, len(games)))
+
+
+def convergence_rows(
+    games: np.ndarray, switch_wins: np.ndarray, stay_wins: np.ndarray
+) -> pd.DataFrame:
+    """
+    Build long-form chart rows for a batch of games.
+
+    Args:
+        games (np.ndarray): 1-based game numbers to include.
+        switch_wins (np.ndarray): Cumulative win rates when switching.
+        stay_wins (np.ndarray): Cumulative win rates when staying.
+
+    Returns:
+        pd.DataFrame: One row per game and strategy.
+    """
+    return pd.DataFrame(
+        {
+            "Number of Simulations": np.concatenate([games, games]),
+            "Strategy": np.repeat(["Switch", "Stay"], len(games)),
+            "Win Probability": np.concatenate(
+                [switch_wins[games - 1], stay_wins[games - 1]]
+            ),
+        }
+    )
+
+
+def animate_convergence(
+    placeholder, switch_wins: np.ndarray, stay_wins: np.ndarray
+) -> None:
+    """
+    Stream the convergence chart into ``placeholder`` frame by frame.
+
+    The chart is sent once with the first frame and every later frame only
+    appends its new rows, so each update costs the size of the frame rather
+    than the whole history. Point and frame budgets are fixed, which bounds
+    the animation time for any number of simulations.
+
+    Args:
+        placeholder: Streamlit container that holds the chart.
+        switch_wins (np.ndarray): Cumulative win rates when switching.
+        stay_wins (np.ndarray): Cumulative win rates when staying.
+    """
+    num_simulations = len(switch_wins)
+    frames = convergence_frames(num_simulations)
+
+    chart = (
+        alt.Chart(convergence_rows(frames[0], switch_wins, stay_wins))
+        .mark_line()
+        .encode(
+            x=alt.X(
+                "Number of Simulations:Q",
+                scale=alt.Scale(domain=[0, num_simulations]),
+            ),
+            y=alt.Y("Win Probability:Q", scale=alt.Scale(domain=[0, 1])),
+            color=alt.Color("Strategy:N", sort=["Switch", "Stay"]),
+        )
+        .properties(title="Monty Hall Simulation Results Over Time", height=400)
+    )
+    element = placeholder.altair_chart(chart, use_container_width=True)
 
-    return switch_wins, stay_wins
+    for games in frames[1:]:
+        time.sleep(FRAME_DELAY)
+        element.add_rows(convergence_rows(games, switch_wins, stay_wins))
 
 
 def main():
@@ -55,50 +174,63 @@ def main():
     """)
 
     st.subheader("Simulation")
-    num_simulations = 2500
+    num_simulations = st.select_slider(
+        "Number of Simulations", options=SIMULATION_OPTIONS, value=2_500
+    )
+    col1, col2 = st.columns(2)
+    n_doors = col1.slider("Number of Doors", 3, 10, 3)
+    doors_opened = col2.number_input(
+        "Doors Opened by the Host", min_value=1, max_value=n_doors - 2, value=1
+    )
 
     # Create a placeholder for the plot
     plot_placeholder = st.empty()
 
     # Create a button to run the simulation
     if st.button("Run Simulation"):
-        switch_wins, stay_wins = monty_hall_simulation(num_simulations)
-
-        # Create the plot
-        fig, ax = plt.subplots(figsize=(10, 6))
-        (line_switch,) = ax.plot([], [], label="Switch")
-        (line_stay,) = ax.plot([], [], label="Stay")
-        ax.set_xlabel("Number of Simulations")
-        ax.set_ylabel("Win Probability")
-        ax.set_title("Monty Hall Simulation Results Over Time")
-        ax.legend()
-        ax.grid(True)
-        ax.set_xlim(0, num_simulations)
-        ax.set_ylim(0, 1)
-
-        # Animate the plot
-        for i in range(1, num_simulations + 1, 100):  # Update every 100 simulations
-            line_switch.set_data(range(1, i + 1), switch_wins[:i])
-            line_stay.set_data(range(1, i + 1), stay_wins[:i])
-            plot_placeholder.pyplot(fig)
+        switch_wins, stay_wins = monty_hall_simulation(
+            num_simulations, n_doors=n_doors, doors_opened=doors_opened
+        )
+
+        animate_convergence(plot_placeholder, switch_wins, stay_wins)
 
         st.write(f"After {num_simulations} simulations:")
         st.write(f"Switching won {switch_wins[-1]:.2%} of the time")
         st.write(f"Staying won {stay_wins[-1]:.2%} of the time")
 
+        # Exact odds for the chosen number of doors and doors opened
+        remaining = n_doors - 1 - doors_opened
+        car, goat = Fraction(1, n_doors), Fraction(n_doors - 1, n_doors)
+        switch = goat / remaining
+        if doors_opened > 1:
+            opened = f"{doors_opened} goat doors"
+        else:
+            opened = "the other goat door" if remaining == 1 else "one goat door"
+        if remaining == 1:
+            after_goat = (
+                "leaving the car behind the unopened door. Switching in this case wins."
+            )
+            switch_odds = f"Probability of initially choosing a goat = {switch}"
+        else:
+            after_goat = (
+                f"leaving the car behind one of the {remaining} other unopened doors. "
+                f"Switching to one of them at random wins 1/{remaining} of the time."
+            )
+            switch_odds = f"{goat} × 1/{remaining} = {switch}"
+
         st.subheader("Explanation")
-        st.write("""
-        The simulation demonstrates that switching doors gives you a 2/3 chance of winning, while staying with your original choice gives you a 1/3 chance.
+        st.write(f"""
+        The simulation demonstrates that switching doors gives you a {switch} ({float(switch):.2%}) chance of winning, while staying with your original choice gives you a {car} ({float(car):.2%}) chance.
 
         Here's why:
 
-        1. Initially, you have a 1/3 chance of choosing the car and a 2/3 chance of choosing a goat.
-        2. If you chose a goat (2/3 chance), Monty will always open the other goat door, leaving the car behind the unopened door. Switching in this case wins.
-        3. If you chose the car (1/3 chance), Monty opens either goat door, and switching in this case loses.
+        1. Initially, you have a {car} chance of choosing the car and a {goat} chance of choosing a goat.
+        2. If you chose a goat ({goat} chance), Monty will always open {opened}, {after_goat}
+        3. If you chose the car ({car} chance), Monty opens goat doors only, and switching in this case loses.
 
         Therefore:
-        - Probability of winning by switching = Probability of initially choosing a goat = 2/3
-        - Probability of winning by staying = Probability of initially choosing the car = 1/3
+        - Probability of winning by switching = {switch_odds}
+        - Probability of winning by staying = Probability of initially choosing the car = {car}
 
         This counterintuitive result is why the Monty Hall problem is so famous in probability theory.
         """)
@@ -3,6 +3,13 @@ import numpy as np
 import seaborn as sns
 import streamlit as st
 
+from caching import memoize
+from distributions.registry import DISTRIBUTIONS, parameter_inputs
+
+# Largest sample matrix drawn at once; bigger requests are split into row chunks
+MEMORY_BUDGET = 256 * 1024**2
+SAMPLE_STATISTICS = ["Mean", "Variance", "Median"]
+
 
 def plot_distribution(ax, data, title, color="blue"):
     sns.histplot(data, kde=True, color=color, ax=ax, bins=30)
@@ -11,26 +18,72 @@ def plot_distribution(ax, data, title, color="blue"):
     ax.set_ylabel("Density")
 
 
-def generate_data(distribution, size, **kwargs):
-    if distribution == "Normal":
-        return np.random.normal(
-            loc=kwargs.get("mean", 0), scale=kwargs.get("std_dev", 1), size=size
-        )
-    elif distribution == "Uniform":
-        return np.random.uniform(
-            low=kwargs.get("low", 0), high=kwargs.get("high", 1), size=size
-        )
-    elif distribution == "Exponential":
-        return np.random.exponential(scale=kwargs.get("scale", 1), size=size)
-    elif distribution == "Triangular":
-        return np.random.triangular(
-            left=kwargs.get("left", 0),
-            mode=kwargs.get("mode", 0.5),
-            right=kwargs.get("right", 1),
-            size=size,
-        )
-    else:
+def generate_data(distribution, size, rng=None, **kwargs):
+    if distribution not in DISTRIBUTIONS:
         raise ValueError("Unsupported distribution")
+    return DISTRIBUTIONS[distribution].sample(size, rng=rng, **kwargs)
+
+
+@memoize
+def draw_population(distribution, size, **kwargs):
+    return generate_data(distribution, size, **kwargs)
+
+
+@memoize
+def sampling_distribution(
+    distribution: str,
+    num_samples: int,
+    sample_size: int,
+    statistics: list[str] = SAMPLE_STATISTICS,
+    memory_budget: int = MEMORY_BUDGET,
+    rng: np.random.Generator | None = None,
+    **kwargs,
+) -> dict[str, np.ndarray]:
+    """
+    Draw repeated samples and reduce each one to its summary statistics.
+
+    Samples are drawn as a ``(num_samples, sample_size)`` matrix and reduced
+    along the sample axis. When that matrix would exceed ``memory_budget``
+    bytes, it is drawn in row chunks that each fit within the budget.
+
+    Args:
+        distribution (str): Name of the original distribution.
+        num_samples (int): Number of samples to draw.
+        sample_size (int): Number of observations per sample.
+        statistics (list[str]): Statistics to compute, any of
+            ``SAMPLE_STATISTICS``. Medians need a partial sort of every
+            sample, so leave them out when they are not shown.
+        memory_budget (int): Maximum size in bytes of one drawn block.
+        rng (np.random.Generator | None): Generator shared by all chunks.
+        **kwargs: Parameters of the original distribution.
+
+    Returns:
+        dict: Arrays of per-sample statistics keyed by statistic name.
+            Variances are NaN when ``sample_size`` is 1.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    rows_per_chunk = max(1, memory_budget // (sample_size * 8))
+    results = {name: np.empty(num_samples) for name in statistics}
+
+    for start in range(0, num_samples, rows_per_chunk):
+        stop = min(start + rows_per_chunk, num_samples)
+        block = generate_data(
+            distribution, size=(stop - start, sample_size), rng=rng, **kwargs
+        )
+        if "Mean" in results:
+            results["Mean"][start:stop] = block.mean(axis=1)
+        if "Variance" in results:
+            results["Variance"][start:stop] = (
+                block.var(axis=1, ddof=1) if sample_size > 1 else np.nan
+            )
+        if "Median" in results:
+            results["Median"][start:stop] = np.median(block, axis=1)
+
+    return results
+
+
+def format_moment(value):
+    return f"{value:.4f}" if np.isfinite(value) else "undefined"
 
 
 def calculate_statistics(data):
@@ -88,46 +141,44 @@ def main():
     # Distribution selection
     distribution = st.selectbox(
         "Select Original Distribution:",
-        ["Normal", "Uniform", "Exponential", "Triangular"],
+        list(DISTRIBUTIONS),
     )
+    spec = DISTRIBUTIONS[distribution]
 
     # Set distribution parameters
-    params = {}
-    if distribution == "Normal":
-        params["mean"] = st.slider("Mean", -10.0, 10.0, 0.0, 0.1)
-        params["std_dev"] = st.slider("Standard Deviation", 0.1, 10.0, 1.0, 0.1)
-    elif distribution == "Uniform":
-        params["low"] = st.slider("Lower Bound", -10.0, 0.0, 0.0, 0.1)
-        params["high"] = st.slider("Upper Bound", 0.0, 10.0, 1.0, 0.1)
-    elif distribution == "Exponential":
-        params["scale"] = st.slider("Scale", 0.1, 10.0, 1.0, 0.1)
-    elif distribution == "Triangular":
-        params["left"] = st.slider("Left", -10.0, 0.0, 0.0, 0.1)
-        params["mode"] = st.slider("Mode", -10.0, 10.0, 0.5, 0.1)
-        params["right"] = st.slider("Right", 0.0, 20.0, 1.0, 0.1)
+    params = parameter_inputs(spec)
+    error = spec.validate(**params)
+    if error:
+        st.error(error)
+        return
 
     # Simulation parameters
-    num_samples = st.slider("Number of Samples", 10, 1000, 100)
-    sample_size = st.slider("Sample Size", 1, 100, 30)
+    num_samples = st.slider("Number of Samples", 10, 100_000, 100)
+    sample_size = st.slider("Sample Size", 1, 10_000, 30)
+    statistics = SAMPLE_STATISTICS if sample_size > 1 else ["Mean", "Median"]
+    statistic = st.radio("Sampling Distribution of the", statistics, horizontal=True)
 
     # Generate data
-    original_data = generate_data(distribution, size=num_samples, **params)
-    sample_means = [
-        np.mean(generate_data(distribution, size=sample_size, **params))
-        for _ in range(num_samples)
-    ]
+    original_data = draw_population(distribution, size=num_samples, **params)
+    sample_stats = sampling_distribution(
+        distribution, num_samples, sample_size, statistics=[statistic], **params
+    )[statistic]
 
     # Calculate statistics
     pop_mean, pop_std, pop_std_error = calculate_statistics(original_data)
-    sample_mean, sample_std, sample_std_error = calculate_statistics(sample_means)
+    sample_mean, sample_std, sample_std_error = calculate_statistics(sample_stats)
 
     # Plot distributions
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
     plot_distribution(ax1, original_data, "Original Distribution", color="blue")
     plot_distribution(
-        ax2, sample_means, "Sampling Distribution of Sample Means", color="green"
+        ax2,
+        sample_stats,
+        f"Sampling Distribution of Sample {statistic}s",
+        color="green",
     )
     st.pyplot(fig)
+    plt.close(fig)
 
     # Display statistics
     st.subheader("Statistics:")
@@ -138,12 +189,25 @@ def main():
         st.write(f"Mean: {pop_mean:.4f}")
         st.write(f"Standard Deviation: {pop_std:.4f}")
         st.write(f"Standard Error: {pop_std_error:.4f}")
+        st.write(f"Theoretical Mean: {format_moment(spec.mean(**params))}")
 
     with col2:
         st.write("Sampling Distribution:")
         st.write(f"Mean: {sample_mean:.4f}")
         st.write(f"Standard Deviation: {sample_std:.4f}")
         st.write(f"Standard Error: {sample_std_error:.4f}")
+        if statistic == "Mean":
+            theoretical_se = np.sqrt(spec.variance(**params) / sample_size)
+            st.write(
+                f"Theoretical Standard Deviation (σ/√n): {format_moment(theoretical_se)}"
+            )
+
+    if not np.isfinite(spec.variance(**params)):
+        st.warning(
+            f"The {distribution} distribution has no finite variance with these "
+            "parameters, so the CLT does not apply and sample means never settle "
+            "into a normal shape."
+        )
 
 
 if __name__ == "__main__":
@@ -1,19 +1,213 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
+from scipy.stats import norm
 
+from caching import memoize
+from distributions.registry import DISTRIBUTIONS, parameter_inputs
 
-def plot_probability_convergence(ax, probabilities):
-    ax.plot(probabilities, color="blue", label="Observed Probability")
-    ax.axhline(y=0.5, color="red", linestyle="--", label="True Probability (0.5)")
-    ax.set_title("Convergence of Coin Flip Probability to 0.5")
+FLIP_OPTIONS = [10**k for k in range(1, 10)]
+TRACE_POINTS = 2_000
+BAND_PATH_OPTIONS = [100, 1_000, 5_000, 10_000]
+BAND_LEVEL = 0.95
+# Paths simulated at once and histogram sketch of standardized deviations
+PATH_CHUNK = 500
+SKETCH_BINS = 2_400
+SKETCH_Z_RANGE = 6.0
+# Probability of the tracked outcome for each path; None means user-chosen
+COIN_PATHS = {
+    "Fair Coin (Heads)": 0.5,
+    "Biased Coin (Heads)": None,
+    "Die (Rolling a Six)": 1 / 6,
+}
+
+
+def plot_probability_convergence(
+    ax, checkpoints, probabilities, paths, log_x=False, bands=None
+):
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    for j, (label, p) in enumerate(paths.items()):
+        color = colors[j % len(colors)]
+        ax.plot(checkpoints, probabilities[:, j], color=color, label=label)
+        ax.axhline(
+            y=p, color=color, linestyle="--", label=f"True Probability ({p:.4f})"
+        )
+        if bands:
+            band_n, lower, upper = bands[label]
+            ax.fill_between(
+                band_n,
+                lower,
+                upper,
+                color=color,
+                alpha=0.2,
+                label=f"Monte Carlo {BAND_LEVEL:.0%} Envelope",
+            )
+            analytic_lower, analytic_upper = analytic_band(band_n, p)
+            ax.plot(band_n, analytic_lower, color=color, linestyle=":")
+            ax.plot(
+                band_n,
+                analytic_upper,
+                color=color,
+                linestyle=":",
+                label=f"Analytic ±z·√(p(1-p)/n) {BAND_LEVEL:.0%} Band",
+            )
+    if log_x:
+        ax.set_xscale("log")
+    if list(paths) == ["Fair Coin (Heads)"]:
+        ax.set_title("Convergence of Coin Flip Probability to 0.5")
+        ax.set_ylabel("Probability of Heads")
+    else:
+        ax.set_title("Convergence of Observed Probabilities")
+        ax.set_ylabel("Observed Probability")
     ax.set_xlabel("Number of Coin Flips")
-    ax.set_ylabel("Probability of Heads")
     ax.legend()
 
 
-def simulate_coin_flips(num_flips):
-    return np.random.choice([0, 1], size=num_flips)
+def plot_mean_convergence(ax, running_means, true_mean, distribution):
+    ax.plot(running_means, color="blue", label="Observed Sample Mean")
+    if np.isfinite(true_mean):
+        ax.axhline(
+            y=true_mean,
+            color="red",
+            linestyle="--",
+            label=f"True Mean ({true_mean:.4f})",
+        )
+    ax.set_title(f"Convergence of the {distribution} Sample Mean")
+    ax.set_xlabel("Number of Draws")
+    ax.set_ylabel("Sample Mean")
+    ax.legend()
+
+
+def trace_checkpoints(num_trials: int, max_points: int = TRACE_POINTS) -> np.ndarray:
+    """
+    Choose the trial counts at which running proportions are recorded.
+
+    Half of the points are log-spaced to resolve the noisy start and half are
+    linear so the tail is covered evenly.
+
+    Args:
+        num_trials (int): Total number of trials.
+        max_points (int): Upper bound on the number of checkpoints.
+
+    Returns:
+        np.ndarray: Strictly increasing trial counts ending at ``num_trials``.
+    """
+    half = max(1, max_points // 2)
+    return np.unique(
+        np.concatenate(
+            [np.geomspace(1, num_trials, half), np.linspace(1, num_trials, half)]
+        ).astype(np.int64)
+    )
+
+
+@memoize
+def simulate_running_proportions(
+    num_trials: int,
+    probabilities: list[float],
+    max_points: int = TRACE_POINTS,
+    rng: np.random.Generator | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate parallel Bernoulli paths and record their running proportions.
+
+    The trials between two consecutive checkpoints are streamed as a single
+    binomial draw per path and added to the carried success count, so time
+    and memory depend on the number of checkpoints, not on ``num_trials``.
+
+    Args:
+        num_trials (int): Number of trials per path.
+        probabilities (list[float]): Success probability of each path.
+        max_points (int): Upper bound on the number of recorded checkpoints.
+        rng (np.random.Generator | None): Generator to draw from.
+
+    Returns:
+        tuple: Checkpoint trial counts and a ``(checkpoints, paths)`` array of
+            running proportions.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    checkpoints = trace_checkpoints(num_trials, max_points)
+    gaps = np.diff(checkpoints, prepend=0)
+    successes = rng.binomial(gaps[:, np.newaxis], np.asarray(probabilities))
+    return checkpoints, np.cumsum(successes, axis=0) / checkpoints[:, np.newaxis]
+
+
+@memoize
+def simulate_percentile_band(
+    num_trials: int,
+    probability: float,
+    num_paths: int,
+    level: float = BAND_LEVEL,
+    max_points: int = TRACE_POINTS,
+    chunk_size: int = PATH_CHUNK,
+    rng: np.random.Generator | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Estimate the empirical percentile envelope of many independent paths.
+
+    Paths are simulated ``chunk_size`` at a time as a ``(checkpoints, chunk)``
+    cumulative-sum matrix. Each chunk is folded into a per-checkpoint
+    histogram of the standardized deviation ``(p_hat - p) / sqrt(p(1-p)/n)``
+    and then discarded, so peak memory is independent of both ``num_paths``
+    and ``num_trials``. Percentiles are read back from the histogram, which
+    resolves them to ``2 * SKETCH_Z_RANGE / SKETCH_BINS`` standard errors.
+
+    Args:
+        num_trials (int): Number of trials per path.
+        probability (float): Success probability of every path.
+        num_paths (int): Number of independent paths.
+        level (float): Central coverage of the envelope.
+        max_points (int): Upper bound on the number of recorded checkpoints.
+        chunk_size (int): Number of paths simulated at once.
+        rng (np.random.Generator | None): Generator to draw from.
+
+    Returns:
+        tuple: Checkpoint trial counts and the lower and upper envelopes.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    checkpoints = trace_checkpoints(num_trials, max_points)
+    gaps = np.diff(checkpoints, prepend=0)
+    std_errors = np.sqrt(probability * (1 - probability) / checkpoints)
+    offsets = np.arange(len(checkpoints))[:, np.newaxis] * SKETCH_BINS
+    counts = np.zeros(len(checkpoints) * SKETCH_BINS, dtype=np.int64)
+
+    for start in range(0, num_paths, chunk_size):
+        paths = min(chunk_size, num_paths - start)
+        successes = rng.binomial(gaps[:, np.newaxis], probability, (len(gaps), paths))
+        proportions = np.cumsum(successes, axis=0) / checkpoints[:, np.newaxis]
+        z = (proportions - probability) / std_errors[:, np.newaxis]
+        bins = ((z + SKETCH_Z_RANGE) * SKETCH_BINS / (2 * SKETCH_Z_RANGE)).astype(
+            np.int64
+        )
+        np.clip(bins, 0, SKETCH_BINS - 1, out=bins)
+        counts += np.bincount((bins + offsets).ravel(), minlength=counts.size)
+
+    cumulative = np.cumsum(counts.reshape(len(checkpoints), SKETCH_BINS), axis=1)
+    bin_width = 2 * SKETCH_Z_RANGE / SKETCH_BINS
+    envelopes = []
+    for q in ((1 - level) / 2, (1 + level) / 2):
+        first_bin = (cumulative < q * num_paths).sum(axis=1)
+        z_q = -SKETCH_Z_RANGE + (first_bin + 0.5) * bin_width
+        envelopes.append(probability + z_q * std_errors)
+    return checkpoints, envelopes[0], envelopes[1]
+
+
+def analytic_band(
+    checkpoints: np.ndarray, probability: float, level: float = BAND_LEVEL
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Normal-approximation band p ± z·sqrt(p(1-p)/n) around the true probability.
+
+    Args:
+        checkpoints (np.ndarray): Trial counts to evaluate the band at.
+        probability (float): True success probability.
+        level (float): Central coverage of the band.
+
+    Returns:
+        tuple: Lower and upper band.
+    """
+    z = norm.ppf((1 + level) / 2)
+    half_width = z * np.sqrt(probability * (1 - probability) / checkpoints)
+    return probability - half_width, probability + half_width
 
 
 def calculate_cumulative_probabilities(flips):
@@ -21,6 +215,32 @@ def calculate_cumulative_probabilities(flips):
     return cumulative_heads / (np.arange(1, len(flips) + 1))
 
 
+def distribution_mean_demo(distribution):
+    spec = DISTRIBUTIONS[distribution]
+    params = parameter_inputs(spec, key="lln")
+    error = spec.validate(**params)
+    if error:
+        st.error(error)
+        return
+
+    num_draws = st.slider("Number of Draws", 10, 10000, 1000)
+    draws = spec.sample(num_draws, **params)
+    running_means = calculate_cumulative_probabilities(draws)
+    true_mean = spec.mean(**params)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    plot_mean_convergence(ax, running_means, true_mean, distribution)
+    st.pyplot(fig)
+    plt.close(fig)
+
+    st.write(f"Final sample mean after {num_draws} draws: {running_means[-1]:.4f}")
+    if not np.isfinite(true_mean):
+        st.warning(
+            f"The {distribution} distribution has no finite mean with these "
+            "parameters, so the sample mean never settles down."
+        )
+
+
 def main():
     st.title("Law of Large Numbers Demonstration")
 
@@ -53,18 +273,53 @@ def main():
     \end{align*}
     """)
 
-    num_flips = st.slider("Number of Coin Flips", 10, 10000, 1000)
+    experiment = st.selectbox("Experiment", ["Coin Flips", *DISTRIBUTIONS])
+    if experiment != "Coin Flips":
+        distribution_mean_demo(experiment)
+        return
 
-    coin_flips = simulate_coin_flips(num_flips)
-    cumulative_probabilities = calculate_cumulative_probabilities(coin_flips)
+    num_flips = st.select_slider(
+        "Number of Coin Flips", options=FLIP_OPTIONS, value=1_000
+    )
+    selected = st.multiselect(
+        "Paths to Simulate", list(COIN_PATHS), default=["Fair Coin (Heads)"]
+    )
+    if not selected:
+        st.info("Select at least one path to simulate.")
+        return
+    paths = {label: COIN_PATHS[label] for label in selected}
+    if "Biased Coin (Heads)" in paths:
+        paths["Biased Coin (Heads)"] = st.slider(
+            "Biased Coin Probability of Heads", 0.01, 0.99, 0.7, 0.01
+        )
+    log_x = st.checkbox("Logarithmic x-axis", value=num_flips > 10_000)
+    show_band = st.checkbox("Show Monte Carlo confidence band")
+    bands = None
+    if show_band:
+        num_paths = st.select_slider(
+            "Independent Paths for the Band", options=BAND_PATH_OPTIONS, value=1_000
+        )
+        bands = {
+            label: simulate_percentile_band(num_flips, p, num_paths)
+            for label, p in paths.items()
+        }
+
+    checkpoints, cumulative_probabilities = simulate_running_proportions(
+        num_flips, list(paths.values())
+    )
 
     fig, ax = plt.subplots(figsize=(10, 6))
-    plot_probability_convergence(ax, cumulative_probabilities)
+    plot_probability_convergence(
+        ax, checkpoints, cumulative_probabilities, paths, log_x=log_x, bands=bands
+    )
     st.pyplot(fig)
+    plt.close(fig)
 
-    st.write(
-        f"Final observed probability after {num_flips} flips: {cumulative_probabilities[-1]:.4f}"
-    )
+    for j, label in enumerate(paths):
+        st.write(
+            f"{label}: final observed probability after {num_flips:,} flips: "
+            f"{cumulative_probabilities[-1, j]:.4f}"
+        )
 
 
 if __name__ == "__main__":
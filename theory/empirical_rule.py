@@ -1,12 +1,13 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
-from scipy.stats import norm
+
+from distributions.registry import DISTRIBUTIONS
 
 
 def plot_normal_distribution(mean, std_dev, percentages):
     x = np.linspace(mean - 4 * std_dev, mean + 4 * std_dev, 1000)
-    y = norm.pdf(x, mean, std_dev)
+    y = DISTRIBUTIONS["Normal"].frozen(mean=mean, std_dev=std_dev).pdf(x)
 
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.plot(x, y, "b-", linewidth=2, label="Normal Distribution")
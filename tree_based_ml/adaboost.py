@@ -2,7 +2,6 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import streamlit as st
-from sklearn.datasets import make_moons
 from sklearn.ensemble import AdaBoostClassifier, AdaBoostRegressor
 from sklearn.metrics import (
     accuracy_score,
@@ -11,7 +10,155 @@ from sklearn.metrics import (
     r2_score,
 )
 from sklearn.model_selection import train_test_split
-from sklearn.tree import DecisionTreeClassifier
+
+from caching import make_moons, memoize
+
+WEIGHT_POINT_OPTIONS = [20, 100, 1_000, 10_000, 100_000]
+MAX_SCATTER_POINTS = 5_000
+CLASS_COLORS = np.array(["#00AEEF", "#FF6B6B"])
+# Largest number of per-sample weights kept for the round scrubber
+HISTORY_BUDGET = 10_000_000
+
+
+def sort_features(X, y):
+    """
+    Sort every feature once so each boosting round can reuse the order.
+
+    Args:
+        X (np.ndarray): ``(n_samples, n_features)`` data.
+        y (np.ndarray): Binary labels in {0, 1}.
+
+    Returns:
+        dict: Per-feature sort ``order``, sorted values ``X_sorted``, the
+            labels as ±1 in sorted order ``signs`` and a
+            ``(n_samples - 1, n_features)`` mask ``splittable`` of positions
+            where a split falls between two distinct values.
+    """
+    order = np.argsort(X, axis=0, kind="stable")
+    X_sorted = np.take_along_axis(X, order, axis=0)
+    return {
+        "order": order,
+        "X_sorted": X_sorted,
+        "signs": (2 * y - 1)[order],
+        "splittable": np.diff(X_sorted, axis=0) > 0,
+    }
+
+
+def best_stump(sorted_data, y, weights):
+    """
+    Find the decision stump with the lowest weighted error on all features.
+
+    One cumulative sum of the signed weights in sorted order gives the
+    weighted error of every threshold and both polarities at once.
+
+    Args:
+        sorted_data (dict): Output of ``sort_features``.
+        y (np.ndarray): Binary labels in {0, 1}.
+        weights (np.ndarray): Sample weights.
+
+    Returns:
+        tuple: Feature index, threshold, class predicted at or below the
+            threshold, and the weighted error.
+    """
+    X_sorted = sorted_data["X_sorted"]
+    # Class 1 minus class 0 weight to the left of each split position
+    margin = np.cumsum(weights[sorted_data["order"]] * sorted_data["signs"], axis=0)
+    margin = margin[:-1]
+    total_pos = np.dot(weights, y)
+    total_neg = weights.sum() - total_pos
+    # Error if the left side predicts class 0 or class 1 respectively
+    err_left0 = total_neg + margin
+    err_left1 = total_pos - margin
+    errors = np.where(
+        sorted_data["splittable"], np.minimum(err_left0, err_left1), np.inf
+    )
+
+    # A stump that puts every point on one side predicts the majority class
+    constant_error = min(total_pos, total_neg)
+    if errors.size == 0 or constant_error <= errors.min():
+        return 0, np.inf, int(total_pos >= total_neg), constant_error
+
+    i, j = np.unravel_index(np.argmin(errors), errors.shape)
+    threshold = (X_sorted[i, j] + X_sorted[i + 1, j]) / 2
+    left_class = int(err_left1[i, j] < err_left0[i, j])
+    return j, threshold, left_class, errors[i, j]
+
+
+def snapshot_rounds(n_points, n_rounds):
+    """
+    Rounds whose weights are stored, spaced to fit ``HISTORY_BUDGET``.
+
+    Args:
+        n_points (int): Number of points in the dataset.
+        n_rounds (int): Number of simulated rounds.
+
+    Returns:
+        np.ndarray: Sorted 1-based round numbers, always including the
+            first and the last round.
+    """
+    stride = -(-n_rounds * n_points // HISTORY_BUDGET)
+    return np.unique(np.r_[np.arange(1, n_rounds + 1, stride), n_rounds])
+
+
+@memoize(resource=True)
+def adaboost_weights(n_points, seed, n_rounds):
+    """
+    Run discrete AdaBoost with NumPy stumps and track the sample weights.
+
+    The history is shared between reruns instead of copied out of the
+    cache on every slider move, so its arrays are returned read-only.
+
+    Args:
+        n_points (int): Number of points in the synthetic dataset.
+        seed (int): Seed of the dataset.
+        n_rounds (int): Number of weight vectors to produce, including the
+            uniform starting weights.
+
+    Returns:
+        dict: The data ``X`` and ``y``, a ``weights`` array with one float32
+            row per round in ``snapshot_rounds`` and per-round ``error``,
+            ``alpha`` and effective sample size ``ess`` arrays.
+    """
+    rng = np.random.RandomState(seed)
+    X = rng.randn(n_points, 2)
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+    sorted_data = sort_features(X, y)
+
+    weights = np.full(n_points, 1 / n_points)
+    stored = snapshot_rounds(n_points, n_rounds)
+    history = np.empty((len(stored), n_points), dtype=np.float32)
+    history[0] = weights
+    slot = 1
+    errors = np.empty(n_rounds - 1)
+    alphas = np.empty(n_rounds - 1)
+    ess = np.empty(n_rounds)
+    ess[0] = n_points
+
+    for r in range(n_rounds - 1):
+        feature, threshold, left_class, _ = best_stump(sorted_data, y, weights)
+        pred = np.where(X[:, feature] <= threshold, left_class, 1 - left_class)
+        wrong = pred != y
+        err = np.clip(np.dot(weights, wrong), 1e-10, 1 - 1e-10)
+        alpha = 0.5 * np.log((1 - err) / err)
+        weights = weights * np.exp(alpha * (2 * wrong - 1))
+        weights /= weights.sum()
+        errors[r], alphas[r] = err, alpha
+        ess[r + 1] = 1 / np.dot(weights, weights)
+        if slot < len(stored) and stored[slot] == r + 2:
+            history[slot] = weights
+            slot += 1
+
+    result = {
+        "X": X,
+        "y": y,
+        "weights": history,
+        "error": errors,
+        "alpha": alphas,
+        "ess": ess,
+    }
+    for values in result.values():
+        values.flags.writeable = False
+    return result
 
 
 def main():
@@ -86,44 +233,57 @@ def main():
         )
         col_ctrl2, col_plot2 = st.columns([1, 2])
         with col_ctrl2:
-            n_rounds = st.slider("Rounds to show", 2, 8, 5, key="ada_s2_r")
-            n_pts = st.slider("Data points", 10, 40, 20, key="ada_s2_n")
+            n_rounds = st.slider("Rounds to simulate", 2, 500, 50, key="ada_s2_r")
+            n_pts = st.select_slider(
+                "Data points", WEIGHT_POINT_OPTIONS, value=100, key="ada_s2_n"
+            )
             seed_val = st.slider("Random seed", 0, 99, 42, key="ada_s2_seed")
+            stored = snapshot_rounds(n_pts, n_rounds).tolist()
+            shown_round = st.select_slider(
+                "Round to inspect", stored, value=stored[-1], key="ada_s2_show"
+            )
             st.info(
-                "Misclassified samples (tall bars) get boosted weight so the next stump must focus on them."
+                "Misclassified samples (large markers) get boosted weight so the next stump must focus on them. Scrub through the rounds to watch the weight concentrate."
             )
 
         with col_plot2:
-            rng = np.random.RandomState(seed_val)
-            n = n_pts
-            Xw = rng.randn(n, 2)
-            yw = (Xw[:, 0] + Xw[:, 1] > 0).astype(int)
-            weights = np.ones(n) / n
-            weight_history = [weights.copy()]
-
-            for _ in range(n_rounds - 1):
-                stump = DecisionTreeClassifier(max_depth=1)
-                stump.fit(Xw, yw, sample_weight=weights)
-                pred = stump.predict(Xw)
-                wrong = pred != yw
-                err = np.clip(np.dot(weights, wrong) / weights.sum(), 1e-10, 1 - 1e-10)
-                alpha = 0.5 * np.log((1 - err) / err)
-                weights *= np.exp(alpha * (2 * wrong.astype(float) - 1))
-                weights /= weights.sum()
-                weight_history.append(weights.copy())
-
-            fig2, axes = plt.subplots(
-                1, n_rounds, figsize=(min(14, n_rounds * 2.5), 3), sharey=True
+            history = adaboost_weights(n_pts, seed_val, n_rounds)
+            Xw, yw = history["X"], history["y"]
+            w = history["weights"][stored.index(shown_round)]
+
+            shown = np.arange(n_pts)
+            if n_pts > MAX_SCATTER_POINTS:
+                # Keep the heaviest points, they are the ones AdaBoost focuses on
+                shown = np.argpartition(w, -MAX_SCATTER_POINTS)[-MAX_SCATTER_POINTS:]
+
+            fig2, (ax_w, ax_h) = plt.subplots(1, 2, figsize=(12, 4))
+            ax_w.scatter(
+                Xw[shown, 0],
+                Xw[shown, 1],
+                s=4 + 400 * w[shown] / w.max(),
+                c=CLASS_COLORS[yw[shown]],
+                alpha=0.6,
+                edgecolors="grey",
+                linewidths=0.3,
+            )
+            ax_w.set_title(
+                f"Round {shown_round}  (size = weight, Red=Class 1, Blue=Class 0)",
+                fontsize=9,
+            )
+            ax_w.set_xticks([])
+            ax_w.set_yticks([])
+
+            rounds = np.arange(1, n_rounds + 1)
+            ax_h.plot(rounds, history["ess"] / n_pts, color="#00AEEF", label="ESS / n")
+            ax_h.plot(
+                rounds[1:], history["error"], color="#FF6B6B", label="Weighted error"
             )
-            if n_rounds == 1:
-                axes = [axes]
-            for i, (w, ax) in enumerate(zip(weight_history, axes)):
-                colors = ["#FF6B6B" if yi == 1 else "#00AEEF" for yi in yw]
-                ax.bar(range(n), w, color=colors, edgecolor="grey", linewidth=0.3)
-                ax.set_title(f"Round {i + 1}", fontsize=9)
-                ax.set_xticks([])
-            axes[0].set_ylabel("Weight")
-            fig2.suptitle("Weight Evolution  (Red=Class 1, Blue=Class 0)", fontsize=9)
+            ax_h.axvline(shown_round, color="green", linestyle="--", alpha=0.7)
+            ax_h.set_xlabel("Round")
+            ax_h.set_ylim(0, 1.05)
+            ax_h.set_title("Weight concentration and stump error", fontsize=9)
+            ax_h.legend(fontsize=8)
+            ax_h.grid(alpha=0.3)
             plt.tight_layout()
             st.pyplot(fig2)
             plt.close(fig2)
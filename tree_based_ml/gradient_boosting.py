@@ -3,7 +3,7 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import streamlit as st
-from sklearn.datasets import make_classification
+from joblib import Parallel, delayed
 from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
 from sklearn.metrics import (
     accuracy_score,
@@ -13,6 +13,72 @@ from sklearn.metrics import (
 )
 from sklearn.model_selection import train_test_split
 
+from caching import make_classification, memoize
+from parallel import partition_threads
+
+
+def staged_accuracy(model, X, y):
+    """
+    Accuracy of a fitted gradient boosting classifier after every stage.
+
+    ``staged_decision_function`` is walked once and stacked into a single
+    ``(n_stages, n_samples[, n_classes])`` score array, and the accuracy of
+    all stages is then counted at once.
+
+    Args:
+        model (GradientBoostingClassifier): Fitted classifier.
+        X (np.ndarray): Samples to score.
+        y (np.ndarray): True labels.
+
+    Returns:
+        np.ndarray: Accuracy per stage, as ``staged_predict`` would give.
+    """
+    scores = np.stack(list(model.staged_decision_function(X)))
+    if scores.shape[-1] == 1:
+        # Binary models yield a single log-odds column
+        scores = scores[..., 0]
+    y_idx = np.searchsorted(model.classes_, y)
+    if scores.ndim == 2:
+        # Ties go to the positive class, as in sklearn's predict
+        predicted = (scores >= 0).astype(int)
+    else:
+        predicted = scores.argmax(axis=2)
+    return (predicted == y_idx).mean(axis=1)
+
+
+def staged_test_accuracy(X_tr, y_tr, X_te, y_te, learning_rate, n_estimators, depth):
+    model = GradientBoostingClassifier(
+        n_estimators=n_estimators,
+        learning_rate=learning_rate,
+        max_depth=depth,
+        random_state=42,
+    )
+    model.fit(X_tr, y_tr)
+    return staged_accuracy(model, X_te, y_te)
+
+
+@memoize
+def learning_rate_curves(learning_rates, n_estimators, depth):
+    """
+    Staged test accuracy for each learning rate, fitted in a process pool.
+
+    Args:
+        learning_rates (tuple[float, ...]): Learning rates to compare.
+        n_estimators (int): Boosting stages per model.
+        depth (int): ``max_depth`` of every tree.
+
+    Returns:
+        dict: Staged test accuracy keyed by learning rate.
+    """
+    X, y = make_classification(n_samples=400, n_features=10, random_state=42)
+    X_tr, X_te, y_tr, y_te = train_test_split(X, y, test_size=0.25, random_state=42)
+    n_jobs, _ = partition_threads(len(learning_rates))
+    curves = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(staged_test_accuracy)(X_tr, y_tr, X_te, y_te, lr, n_estimators, depth)
+        for lr in learning_rates
+    )
+    return dict(zip(learning_rates, curves, strict=True))
+
 
 def main():
     st.title("📈 Gradient Boosting")
@@ -63,8 +129,8 @@ def main():
                 random_state=42,
             )
             gb1.fit(X1_tr, y1_tr)
-            train_sc = [accuracy_score(y1_tr, p) for p in gb1.staged_predict(X1_tr)]
-            test_sc = [accuracy_score(y1_te, p) for p in gb1.staged_predict(X1_te)]
+            train_sc = staged_accuracy(gb1, X1_tr, y1_tr)
+            test_sc = staged_accuracy(gb1, X1_te, y1_te)
             best_idx = int(np.argmax(test_sc))
 
             fig1, ax1 = plt.subplots(figsize=(7, 3.5))
@@ -106,24 +172,11 @@ def main():
 
         with col_plot2:
             if selected_lrs:
-                X2, y2 = make_classification(
-                    n_samples=400, n_features=10, random_state=42
-                )
-                X2_tr, X2_te, y2_tr, y2_te = train_test_split(
-                    X2, y2, test_size=0.25, random_state=42
+                curves = learning_rate_curves(
+                    tuple(sorted(selected_lrs)), n_est_2, depth_2
                 )
                 fig2, ax2 = plt.subplots(figsize=(7, 3.5))
-                for lr in sorted(selected_lrs):
-                    gb2 = GradientBoostingClassifier(
-                        n_estimators=n_est_2,
-                        learning_rate=lr,
-                        max_depth=depth_2,
-                        random_state=42,
-                    )
-                    gb2.fit(X2_tr, y2_tr)
-                    scores = [
-                        accuracy_score(y2_te, p) for p in gb2.staged_predict(X2_te)
-                    ]
+                for lr, scores in curves.items():
                     ax2.plot(scores, label=f"LR={lr}")
                 ax2.set_xlabel("Boosting Stage")
                 ax2.set_ylabel("Test Accuracy")
@@ -1,9 +1,10 @@
+import time
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
 import streamlit as st
-from sklearn.datasets import make_classification
 from sklearn.metrics import (
     accuracy_score,
     classification_report,
@@ -12,6 +13,9 @@ from sklearn.metrics import (
 )
 from sklearn.model_selection import train_test_split
 
+from caching import make_classification, memoize
+from tree_based_ml.sweep import run_sweep
+
 try:
     import lightgbm as lgb
 
@@ -20,6 +24,49 @@ except ImportError:
     LGB_AVAILABLE = False
 
 
+@memoize
+def num_leaves_sweep(n_samples, n_estimators, learning_rate, leaf_range):
+    """
+    Test accuracy and fit time of LightGBM for each ``num_leaves`` value.
+
+    One ``lgb.Dataset`` is constructed up front and kept with
+    ``free_raw_data=False``, so every fit reuses its histogram bin mappers
+    instead of re-binning the training data. Fits run concurrently with
+    ``num_threads`` split between them.
+
+    Args:
+        n_samples (int): Size of the synthetic dataset.
+        n_estimators (int): Boosting rounds per model.
+        learning_rate (float): Shrinkage per round.
+        leaf_range (tuple[int, ...]): ``num_leaves`` values to test.
+
+    Returns:
+        tuple: Test accuracies and per-fit wall times in seconds.
+    """
+    X, y = make_classification(n_samples=n_samples, n_features=10, random_state=42)
+    X_tr, X_te, y_tr, y_te = train_test_split(X, y, test_size=0.2, random_state=42)
+    dataset_params = {"verbose": -1, "seed": 42}
+    train_set = lgb.Dataset(
+        X_tr, y_tr, params=dataset_params, free_raw_data=False
+    ).construct()
+
+    def fit(num_leaves, n_threads):
+        params = {
+            **dataset_params,
+            "objective": "binary",
+            "num_leaves": num_leaves,
+            "learning_rate": learning_rate,
+            "num_threads": n_threads,
+        }
+        start = time.perf_counter()
+        booster = lgb.train(params, train_set, num_boost_round=n_estimators)
+        fit_time = time.perf_counter() - start
+        return accuracy_score(y_te, booster.predict(X_te) > 0.5), fit_time
+
+    results = run_sweep(fit, leaf_range)
+    return [acc for acc, _ in results], [t for _, t in results]
+
+
 def main():
     st.title("🌿 LightGBM (Light Gradient Boosting Machine)")
 
@@ -67,31 +114,29 @@ def main():
             )
 
         with col_plot1:
-            X1, y1 = make_classification(
-                n_samples=n_samp_1, n_features=10, random_state=42
-            )
-            X1_tr, X1_te, y1_tr, y1_te = train_test_split(
-                X1, y1, test_size=0.2, random_state=42
-            )
-            leaf_range = list(range(4, max_leaves + 1, max(1, max_leaves // 16)))
-            accs = []
-            for nl in leaf_range:
-                m = lgb.LGBMClassifier(
-                    n_estimators=n_est_1,
-                    num_leaves=nl,
-                    learning_rate=lr_1,
-                    verbose=-1,
-                    random_state=42,
-                )
-                m.fit(X1_tr, y1_tr)
-                accs.append(accuracy_score(y1_te, m.predict(X1_te)))
+            leaf_range = tuple(range(4, max_leaves + 1, max(1, max_leaves // 16)))
+            accs, fit_times = num_leaves_sweep(n_samp_1, n_est_1, lr_1, leaf_range)
 
             fig1, ax1 = plt.subplots(figsize=(7, 3.5))
-            ax1.plot(leaf_range, accs, marker="o", color="#2ECC71")
+            ax1.plot(
+                leaf_range, accs, marker="o", color="#2ECC71", label="Test Accuracy"
+            )
             ax1.set_xlabel("num_leaves")
             ax1.set_ylabel("Test Accuracy")
             ax1.set_title(f"Accuracy vs num_leaves  (LR={lr_1}, n_est={n_est_1})")
             ax1.grid(alpha=0.3)
+            ax1_t = ax1.twinx()
+            ax1_t.plot(
+                leaf_range,
+                np.array(fit_times) * 1000,
+                marker="s",
+                linestyle="--",
+                color="#F39C12",
+                label="Fit Time (ms)",
+            )
+            ax1_t.set_ylabel("Fit Time (ms)")
+            lines = ax1.get_lines() + ax1_t.get_lines()
+            ax1.legend(lines, [line.get_label() for line in lines], fontsize=8)
             plt.tight_layout()
             st.pyplot(fig1)
             plt.close(fig1)
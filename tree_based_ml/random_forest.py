@@ -3,8 +3,11 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import streamlit as st
-from sklearn.datasets import make_classification
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.ensemble._forest import (
+    _generate_unsampled_indices,
+    _get_n_samples_bootstrap,
+)
 from sklearn.metrics import (
     accuracy_score,
     classification_report,
@@ -13,6 +16,93 @@ from sklearn.metrics import (
 )
 from sklearn.model_selection import train_test_split
 
+from caching import make_classification, memoize
+
+
+def tree_probas(forest, X):
+    """
+    Class probabilities of every tree in a fitted forest.
+
+    Args:
+        forest (RandomForestClassifier): Fitted forest.
+        X (np.ndarray): Samples to score.
+
+    Returns:
+        np.ndarray: ``(n_trees, n_samples, n_classes)`` probabilities.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    return np.stack(
+        [tree.predict_proba(X, check_input=False) for tree in forest.estimators_]
+    )
+
+
+def staged_oob_votes(forest, probas):
+    """
+    Cumulative out-of-bag soft votes after each added tree.
+
+    Each training sample only receives votes from trees whose bootstrap
+    sample left it out, matching how ``oob_score_`` is computed.
+
+    Args:
+        forest (RandomForestClassifier): Fitted forest.
+        probas (np.ndarray): Per-tree probabilities on the training samples.
+
+    Returns:
+        np.ndarray: ``(n_trees, n_samples, n_classes)`` cumulative OOB votes.
+    """
+    n_trees, n_samples, _ = probas.shape
+    n_bootstrap = _get_n_samples_bootstrap(n_samples, forest.max_samples)
+    oob_mask = np.zeros((n_trees, n_samples, 1))
+    for i, tree in enumerate(forest.estimators_):
+        unsampled = _generate_unsampled_indices(
+            tree.random_state, n_samples, n_bootstrap
+        )
+        oob_mask[i, unsampled] = 1.0
+    return np.cumsum(probas * oob_mask, axis=0)
+
+
+def staged_error(votes, classes, y):
+    """Error rate of the prefix-vote prediction at every forest size."""
+    predictions = classes[votes.argmax(axis=2)]
+    return (predictions != y).mean(axis=1)
+
+
+@memoize
+def error_curve(n_samples, n_features, max_trees, max_depth):
+    """
+    Train, test and out-of-bag error for every forest size up to ``max_trees``.
+
+    A single forest of ``max_trees`` trees is fitted. Because a forest of k
+    trees predicts with the averaged probabilities of its trees, the error of
+    every smaller forest follows from cumulative sums of per-tree votes.
+
+    Returns:
+        tuple: Tree counts and the train, test and OOB error at each count.
+    """
+    X, y = make_classification(
+        n_samples=n_samples, n_features=n_features, random_state=42
+    )
+    X_tr, X_te, y_tr, y_te = train_test_split(X, y, test_size=0.2, random_state=42)
+    rf = RandomForestClassifier(
+        n_estimators=max_trees, max_depth=max_depth, random_state=42, n_jobs=-1
+    )
+    rf.fit(X_tr, y_tr)
+
+    train_probas = tree_probas(rf, X_tr)
+    train_errs = staged_error(np.cumsum(train_probas, axis=0), rf.classes_, y_tr)
+    test_votes = np.cumsum(tree_probas(rf, X_te), axis=0)
+    test_errs = staged_error(test_votes, rf.classes_, y_te)
+
+    # Samples not yet out-of-bag for any tree have no OOB prediction
+    oob_votes = staged_oob_votes(rf, train_probas)
+    covered = oob_votes.sum(axis=2) > 0
+    oob_wrong = (rf.classes_[oob_votes.argmax(axis=2)] != y_tr) & covered
+    with np.errstate(invalid="ignore"):
+        oob_errs = oob_wrong.sum(axis=1) / covered.sum(axis=1)
+
+    est_range = np.arange(1, max_trees + 1)
+    return est_range, train_errs, test_errs, oob_errs
+
 
 def main():
     st.title("🌲 Random Forest")
@@ -48,28 +138,19 @@ def main():
                 "Max trees to test", 10, 200, 100, step=10, key="rf_s1_t"
             )
             max_d_1 = st.slider("max_depth", 1, 20, 10, key="rf_s1_d")
+            show_oob = st.checkbox("Show out-of-bag error", key="rf_s1_oob")
             st.info("More trees → lower variance. Error stabilises after ~50 trees.")
 
         with col_plot1:
-            X1, y1 = make_classification(
-                n_samples=n_samples_1, n_features=n_features_1, random_state=42
+            est_range, train_errs, test_errs, oob_errs = error_curve(
+                n_samples_1, n_features_1, max_trees, max_d_1
             )
-            X1_tr, X1_te, y1_tr, y1_te = train_test_split(
-                X1, y1, test_size=0.2, random_state=42
-            )
-            est_range = range(1, max_trees + 1, max(1, max_trees // 20))
-            train_errs, test_errs = [], []
-            for n in est_range:
-                rf = RandomForestClassifier(
-                    n_estimators=n, max_depth=max_d_1, random_state=42, n_jobs=-1
-                )
-                rf.fit(X1_tr, y1_tr)
-                train_errs.append(1 - accuracy_score(y1_tr, rf.predict(X1_tr)))
-                test_errs.append(1 - accuracy_score(y1_te, rf.predict(X1_te)))
 
             fig1, ax1 = plt.subplots(figsize=(7, 3.5))
-            ax1.plot(list(est_range), train_errs, label="Train Error", color="#00AEEF")
-            ax1.plot(list(est_range), test_errs, label="Test Error", color="#FF6B6B")
+            ax1.plot(est_range, train_errs, label="Train Error", color="#00AEEF")
+            ax1.plot(est_range, test_errs, label="Test Error", color="#FF6B6B")
+            if show_oob:
+                ax1.plot(est_range, oob_errs, label="OOB Error", color="#FFD166")
             ax1.set_xlabel("Number of Trees")
             ax1.set_ylabel("Error Rate")
             ax1.set_title(
@@ -0,0 +1,27 @@
+"""
+Hyperparameter Sweeps - Bounded thread pool shared by the boosting pages
+Concurrent fits split the cores with ``parallel.partition_threads``
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from parallel import DEFAULT_MAX_WORKERS, partition_threads
+
+
+def run_sweep(fit, configs, max_workers: int = DEFAULT_MAX_WORKERS) -> list:
+    """
+    Run ``fit(config, n_threads)`` for every config in a bounded thread pool.
+
+    Args:
+        fit (callable): Trains and scores one configuration. Receives the
+            config and the number of threads it may use.
+        configs (list): Configurations to evaluate.
+        max_workers (int): Upper bound on concurrent fits.
+
+    Returns:
+        list: Results in the same order as ``configs``.
+    """
+    configs = list(configs)
+    workers, threads = partition_threads(len(configs), max_workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda config: fit(config, threads), configs))
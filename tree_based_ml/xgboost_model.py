@@ -3,7 +3,6 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import streamlit as st
-from sklearn.datasets import make_classification
 from sklearn.metrics import (
     accuracy_score,
     classification_report,
@@ -12,6 +11,9 @@ from sklearn.metrics import (
 )
 from sklearn.model_selection import train_test_split
 
+from caching import make_classification, memoize
+from tree_based_ml.sweep import run_sweep
+
 try:
     import xgboost as xgb
 
@@ -20,6 +22,55 @@ except ImportError:
     XGB_AVAILABLE = False
 
 
+@memoize
+def regularisation_sweep(data_seed, n_informative, n_estimators, grid):
+    """
+    Test accuracy of L1-only and L2-only models over a regularisation grid.
+
+    The training data is binned once into a ``QuantileDMatrix`` that every
+    fit reuses, and the fits run concurrently with ``nthread`` split between
+    them. Results are cached per (data seed, grid).
+
+    Args:
+        data_seed (int): Seed of the synthetic dataset and of every model.
+        n_informative (int): Informative features out of 20.
+        n_estimators (int): Boosting rounds per model.
+        grid (tuple[float, ...]): Regularisation strengths to test.
+
+    Returns:
+        tuple: L1 accuracies and L2 accuracies, one per grid value.
+    """
+    X, y = make_classification(
+        n_samples=500,
+        n_features=20,
+        n_informative=n_informative,
+        random_state=data_seed,
+    )
+    X_tr, X_te, y_tr, y_te = train_test_split(
+        X, y, test_size=0.2, random_state=data_seed
+    )
+    dtrain = xgb.QuantileDMatrix(X_tr, y_tr)
+    dtest = xgb.QuantileDMatrix(X_te, ref=dtrain)
+
+    def fit(config, n_threads):
+        reg_alpha, reg_lambda = config
+        params = {
+            "objective": "binary:logistic",
+            "tree_method": "hist",
+            "alpha": reg_alpha,
+            "lambda": reg_lambda,
+            "nthread": n_threads,
+            "seed": data_seed,
+            "verbosity": 0,
+        }
+        booster = xgb.train(params, dtrain, num_boost_round=n_estimators)
+        return accuracy_score(y_te, booster.predict(dtest) > 0.5)
+
+    configs = [(a, 0.0) for a in grid] + [(0.0, a) for a in grid]
+    accs = run_sweep(fit, configs)
+    return accs[: len(grid)], accs[len(grid) :]
+
+
 def main():
     st.title("⚡ XGBoost (Extreme Gradient Boosting)")
 
@@ -127,37 +178,10 @@ def main():
             )
 
         with col_plot2:
-            X2, y2 = make_classification(
-                n_samples=500,
-                n_features=20,
-                n_informative=n_informative_2,
-                random_state=42,
-            )
-            X2_tr, X2_te, y2_tr, y2_te = train_test_split(
-                X2, y2, test_size=0.2, random_state=42
-            )
             alphas = np.linspace(0, alpha_max, 12)
-            l1_accs, l2_accs = [], []
-            for a in alphas:
-                m_l1 = xgb.XGBClassifier(
-                    n_estimators=n_est_2,
-                    reg_alpha=float(a),
-                    reg_lambda=0.0,
-                    verbosity=0,
-                    random_state=42,
-                )
-                m_l1.fit(X2_tr, y2_tr)
-                l1_accs.append(accuracy_score(y2_te, m_l1.predict(X2_te)))
-
-                m_l2 = xgb.XGBClassifier(
-                    n_estimators=n_est_2,
-                    reg_alpha=0.0,
-                    reg_lambda=float(a),
-                    verbosity=0,
-                    random_state=42,
-                )
-                m_l2.fit(X2_tr, y2_tr)
-                l2_accs.append(accuracy_score(y2_te, m_l2.predict(X2_te)))
+            l1_accs, l2_accs = regularisation_sweep(
+                42, n_informative_2, n_est_2, tuple(alphas.tolist())
+            )
 
             fig2, ax2 = plt.subplots(figsize=(7, 3.5))
             ax2.plot(